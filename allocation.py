@@ -0,0 +1,271 @@
+#  madakixo
+## Stock allocation: matches the litres each site needs (per paint type, e.g. from
+## BatchEstimator or pack_sites) to depot stock. Three objectives:
+##   nearest    the default, a fast greedy heuristic: a heap always serves the closest
+##              remaining (site, depot) pair; not optimal, but thousands of sites and
+##              depots take well under a second
+##   distance   exact minimum litre-distance (min-cost flow, successive shortest paths);
+##              seconds per paint type at 1,000 sites x 200 depots, minutes at 2,000 x 1,000
+##   shipments  greedy: serve each site from as few depots as possible, nearest first
+
+import heapq
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+Location = Tuple[float, float]
+
+
+class Shipment(NamedTuple):
+    """Litres of one paint type sent from a depot to a site."""
+    depot: str
+    site: str
+    paint_type: str
+    litres: float
+    distance: float
+
+
+def distance_matrix(site_locations: Dict[str, Location], depot_locations: Dict[str, Location]) -> np.ndarray:
+    """Straight-line distance from every site (rows) to every depot (columns), in location units."""
+    sites = np.array(list(site_locations.values()), dtype=np.float64).reshape(-1, 2)
+    depots = np.array(list(depot_locations.values()), dtype=np.float64).reshape(-1, 2)
+    return np.hypot(sites[:, None, 0] - depots[None, :, 0], sites[:, None, 1] - depots[None, :, 1])
+
+
+EPSILON: float = 1e-9  # litres treated as zero
+
+
+def _update_potentials(need: np.ndarray, supply: np.ndarray, cost: np.ndarray, flow: np.ndarray,
+                       potentials: List[np.ndarray]) -> bool:
+    """
+    Dijkstra from the source over the residual network, in reduced costs, then raise the
+    [site, depot, sink] potentials by the distances so every shortest path has zero reduced cost.
+    Site -> depot arcs are dense, so each settled site relaxes a whole row with NumPy.
+
+    Returns:
+        False if no depot with stock left can be reached.
+    """
+    site_potential, depot_potential, sink_potential = potentials
+    sites, depots = cost.shape
+    # Sites with need left hang off the source by a free arc.
+    site_dist = np.where(need > EPSILON, -site_potential, np.inf)
+    depot_dist = np.full(depots, np.inf)
+    site_done, depot_done = np.zeros(sites, dtype=bool), np.zeros(depots, dtype=bool)
+    # They are all at distance 0 (the minimum), so they are settled together in one step.
+    first = site_dist <= 0
+    if first.any():
+        depot_dist = (cost[first] + (site_dist + site_potential)[first, None]).min(axis=0) - depot_potential
+    site_done[first] = True
+    open_sites = np.where(site_done, np.inf, site_dist)  # inf once settled
+    open_depots = depot_dist.copy()
+    sink_dist = np.inf
+    while True:
+        s, d = int(np.argmin(open_sites)), int(np.argmin(open_depots))
+        if min(open_sites[s], open_depots[d]) >= sink_dist:
+            break
+        if open_sites[s] <= open_depots[d]:
+            site_done[s], open_sites[s] = True, np.inf
+            reduced = site_dist[s] + cost[s] + site_potential[s] - depot_potential
+            better = (reduced < depot_dist) & ~depot_done
+            depot_dist[better] = open_depots[better] = reduced[better]
+        else:
+            depot_done[d], open_depots[d] = True, np.inf
+            if supply[d] > EPSILON:
+                sink_dist = min(sink_dist, depot_dist[d] + depot_potential[d] - sink_potential[0])
+            # Residual reverse arcs: part of an earlier shipment from depot d can be undone.
+            reduced = depot_dist[d] - cost[:, d] + depot_potential[d] - site_potential
+            better = (flow[:, d] > EPSILON) & (reduced < site_dist) & ~site_done
+            site_dist[better] = open_sites[better] = reduced[better]
+    if not np.isfinite(sink_dist):
+        return False
+    site_potential += np.minimum(site_dist, sink_dist)
+    depot_potential += np.minimum(depot_dist, sink_dist)
+    sink_potential += sink_dist
+    return True
+
+
+def _admissible_path(need: np.ndarray, supply: np.ndarray, forward: np.ndarray, backward: np.ndarray,
+                     to_sink: np.ndarray, flow: np.ndarray) -> Optional[List[Tuple[int, int]]]:
+    """
+    Breadth-first search for a source -> sink path using only zero-reduced-cost arcs
+    (`forward` site -> depot arcs, `backward` depot -> site arcs where flow can be undone,
+    `to_sink` depot -> sink arcs where stock is left).
+
+    Returns:
+        The path as (site, depot) shipment steps from the sink end back to the source end,
+        or None when there is none.
+    """
+    sites, depots = forward.shape
+    site_from = np.full(sites, -1)    # depot each site was reached from (-1: the source)
+    depot_from = np.full(depots, -1)  # site each depot was reached from
+    # Sites with need left keep potential 0, so their arcs from the source stay at zero cost.
+    site_seen = need > EPSILON
+    depot_seen = np.zeros(depots, dtype=bool)
+    frontier = np.flatnonzero(site_seen)
+    while len(frontier):
+        arcs = forward[frontier] & ~depot_seen
+        reached = arcs.any(axis=0)
+        new_depots = np.flatnonzero(reached)
+        if not len(new_depots):
+            return None
+        depot_from[new_depots] = frontier[arcs[:, new_depots].argmax(axis=0)]
+        depot_seen |= reached
+        ends = new_depots[(supply[new_depots] > EPSILON) & to_sink[new_depots]]
+        if len(ends):
+            path, d = [], int(ends[0])
+            while True:
+                s = int(depot_from[d])
+                path.append((s, d))
+                if site_from[s] < 0:
+                    return path
+                d = int(site_from[s])
+        arcs = (backward[:, new_depots] & (flow[:, new_depots] > EPSILON)).T & ~site_seen
+        reached = arcs.any(axis=0)
+        frontier = np.flatnonzero(reached)
+        site_from[frontier] = new_depots[arcs[:, frontier].argmax(axis=0)]
+        site_seen |= reached
+    return None
+
+
+def _min_cost_flow(need: np.ndarray, supply: np.ndarray, cost: np.ndarray) -> np.ndarray:
+    """
+    Minimum-cost flow from sites (`need`) to depots (`supply`) with per-litre `cost`[site, depot].
+
+    Successive shortest paths with node potentials (primal-dual): Dijkstra sets potentials so
+    that shortest paths have zero reduced cost, then stock is pushed along zero-cost paths,
+    found by vectorised breadth-first search, until none is left; repeat. Paths may undo part of
+    an earlier shipment (depot -> site), which is what makes the result optimal, not greedy.
+
+    Returns:
+        Flow matrix [site, depot] in litres. If supply falls short, as much as possible is
+        delivered, at minimum cost for that amount.
+    """
+    need, supply = need.astype(np.float64), supply.astype(np.float64)
+    flow = np.zeros(cost.shape)
+    potentials = [np.zeros(cost.shape[0]), np.zeros(cost.shape[1]), np.zeros(1)]
+    tolerance = 1e-9 * (1.0 + float(cost.max(initial=0.0)))
+    while need.max(initial=0.0) > EPSILON and supply.max(initial=0.0) > EPSILON:
+        if not _update_potentials(need, supply, cost, flow, potentials):
+            break  # no depot with stock left is reachable
+        reduced = cost + potentials[0][:, None] - potentials[1][None, :]
+        forward, backward = reduced <= tolerance, np.abs(reduced) <= tolerance
+        to_sink = potentials[1] - potentials[2][0] <= tolerance
+        while True:
+            path = _admissible_path(need, supply, forward, backward, to_sink, flow)
+            if path is None:
+                break
+            # Shipments undone along the way: a step's site was reached from the next step's depot.
+            returned = [(s, d) for (s, _), (_, d) in zip(path, path[1:])]
+            first_site, last_depot = path[-1][0], path[0][1]
+            amount = min([need[first_site], supply[last_depot]] + [flow[s, d] for s, d in returned])
+            for s, d in path:
+                flow[s, d] += amount
+            for s, d in returned:
+                flow[s, d] = max(0.0, flow[s, d] - amount)
+            need[first_site] -= amount
+            supply[last_depot] -= amount
+    return flow
+
+
+def _by_min_cost(requirements: Dict[str, Dict[str, float]], stock: np.ndarray, paint_types: List[str],
+                 sites: List[str], depots: List[str], distances: np.ndarray) -> List[Shipment]:
+    shipments: List[Shipment] = []
+    for p, paint_type in enumerate(paint_types):
+        need = np.array([requirements[site].get(paint_type, 0.0) for site in sites], dtype=np.float64)
+        flow = _min_cost_flow(need, stock[:, p], distances)
+        stock[:, p] -= flow.sum(axis=0)
+        for s, d in zip(*np.nonzero(flow > EPSILON)):
+            shipments.append(Shipment(depots[d], sites[s], paint_type, float(flow[s, d]), float(distances[s, d])))
+    return shipments
+
+
+def _by_nearest(requirements: Dict[str, Dict[str, float]], stock: np.ndarray, paint_types: List[str],
+                 sites: List[str], depots: List[str], distances: np.ndarray) -> List[Shipment]:
+    order = np.argsort(distances, axis=1, kind='stable')
+    shipments: List[Shipment] = []
+    for p, paint_type in enumerate(paint_types):
+        need = np.array([requirements[site].get(paint_type, 0.0) for site in sites], dtype=np.float64)
+        # One heap entry per unserved site: (distance to its next depot, site, rank of that depot).
+        heap = [(distances[s, order[s, 0]], s, 0) for s in np.flatnonzero(need > 0)]
+        heapq.heapify(heap)
+        while heap:
+            distance, s, rank = heapq.heappop(heap)
+            d = order[s, rank]
+            litres = min(need[s], stock[d, p])
+            if litres > 0:
+                shipments.append(Shipment(depots[d], sites[s], paint_type, float(litres), float(distance)))
+                need[s] -= litres
+                stock[d, p] -= litres
+            if need[s] > 0 and rank + 1 < len(depots):
+                heapq.heappush(heap, (distances[s, order[s, rank + 1]], s, rank + 1))
+    return shipments
+
+
+def _by_shipments(requirements: Dict[str, Dict[str, float]], stock: np.ndarray, paint_types: List[str],
+                  sites: List[str], depots: List[str], distances: np.ndarray) -> List[Shipment]:
+    shipments: List[Shipment] = []
+    demand = np.array([[requirements[site].get(p, 0.0) for p in paint_types] for site in sites], dtype=np.float64).reshape(len(sites), -1)
+    # Largest sites first: they are the hardest to serve from a single depot.
+    for s in np.argsort(-demand.sum(axis=1), kind='stable'):
+        need = demand[s].copy()
+        while need.sum() > 1e-9:
+            coverable = np.minimum(stock, need).sum(axis=1)
+            if coverable.max() <= 1e-9:
+                break
+            # Prefer a depot that covers everything left, else the one covering most; nearest on ties.
+            complete = coverable >= need.sum() - 1e-9
+            candidates = np.flatnonzero(complete) if complete.any() else np.flatnonzero(coverable >= coverable.max() - 1e-9)
+            d = candidates[np.argmin(distances[s, candidates])]
+            sent = np.minimum(stock[d], need)
+            for p in np.flatnonzero(sent > 0):
+                shipments.append(Shipment(depots[d], sites[s], paint_types[p], float(sent[p]), float(distances[s, d])))
+            stock[d] -= sent
+            need -= sent
+    return shipments
+
+
+ALLOCATORS = {'distance': _by_min_cost, 'nearest': _by_nearest, 'shipments': _by_shipments}
+
+
+def allocate_stock(requirements: Dict[str, Dict[str, float]], depot_stock: Dict[str, Dict[str, float]],
+                   site_locations: Dict[str, Location], depot_locations: Dict[str, Location],
+                   objective: str = 'nearest') -> Tuple[List[Shipment], Dict[str, Dict[str, float]]]:
+    """
+    Allocate depot stock to site requirements.
+
+    Args:
+        requirements: Litres needed per paint type at each site.
+        depot_stock: Litres in stock per paint type at each depot.
+        site_locations: (x, y) of each site, e.g. in km on a local grid.
+        depot_locations: (x, y) of each depot.
+        objective: 'nearest' for the greedy closest-pair heuristic (under a second for
+            thousands of sites and depots, but not optimal), 'distance' for the minimum
+            total litre-distance (exact min-cost flow; about 3-7 s per paint type for
+            1,000 sites and 200 depots and 50-150 s for 2,000 and 1,000, growing roughly with
+            (sites + depots)² × depots), or 'shipments' to serve each site from as few
+            depots as possible (greedy).
+
+    Returns:
+        The shipments, and the litres per paint type that no depot could supply, per site.
+    """
+    if objective not in ALLOCATORS:
+        raise ValueError(f"Unknown objective {objective}. Use one of: {', '.join(ALLOCATORS)}.")
+    sites, depots = list(requirements), list(depot_stock)
+    paint_types = sorted({p for needs in requirements.values() for p in needs})
+    stock = np.array([[depot_stock[d].get(p, 0.0) for p in paint_types] for d in depots],
+                     dtype=np.float64).reshape(len(depots), len(paint_types))
+    distances = distance_matrix({s: site_locations[s] for s in sites}, {d: depot_locations[d] for d in depots})
+
+    shipments = ALLOCATORS[objective](requirements, stock, paint_types, sites, depots, distances)
+
+    supplied: Dict[Tuple[str, str], float] = {}
+    for shipment in shipments:
+        key = (shipment.site, shipment.paint_type)
+        supplied[key] = supplied.get(key, 0.0) + shipment.litres
+    unmet: Dict[str, Dict[str, float]] = {}
+    for site, needs in requirements.items():
+        short = {p: litres - supplied.get((site, p), 0.0) for p, litres in needs.items()
+                 if litres - supplied.get((site, p), 0.0) > 1e-9}
+        if short:
+            unmet[site] = short
+    return shipments, unmet
@@ -0,0 +1,91 @@
+#  madakixo
+## Net paintable area index. Paint needed is linear in the coverage rate, so once
+## the net wall area is summed per paint type (and per project and group), a new
+## rate table re-prices the whole portfolio in O(number of paint types) instead
+## of re-running every room through calculate_paint_requirement.
+
+from collections import defaultdict
+from typing import Dict, Iterable, Optional, Tuple
+
+from batch_estimate import Room
+from paint_1 import PaintCalculator
+
+
+class AreaIndex:
+    """Net paintable area (m²) summed per paint type, per project and per group."""
+
+    def __init__(self, calculator: Optional[PaintCalculator] = None):
+        """
+        Args:
+            calculator: Supplies the current coverage rates (a new PaintCalculator by default).
+        """
+        self.coverage_rates: Dict[str, float] = dict((calculator or PaintCalculator()).coverage_rates)
+        self.by_type: Dict[str, float] = defaultdict(float)
+        self.by_project: Dict[Tuple[str, str], float] = defaultdict(float)
+        self.by_group: Dict[Tuple[str, str, str], float] = defaultdict(float)
+        self.skipped = 0
+
+    def add_room(self, room: Room, project: str = '', group: str = '') -> None:
+        """
+        Add one room's net wall area. Rooms with a negative net area are skipped, since
+        calculate_paint_requirement gives them 0 liters whatever the rate.
+        """
+        net_wall_area = room['perimeter'] * room['height'] - sum(room['window_areas']) - sum(room['door_areas'])
+        if net_wall_area < 0:
+            self.skipped += 1
+            return
+        paint_type = room['paint_type']
+        self.by_type[paint_type] += net_wall_area
+        self.by_project[project, paint_type] += net_wall_area
+        self.by_group[project, group, paint_type] += net_wall_area
+
+    @classmethod
+    def from_rooms(cls, rooms: Iterable[Room], project_field: str = 'project', group_field: str = 'building',
+                   calculator: Optional[PaintCalculator] = None) -> 'AreaIndex':
+        """Build an index from rooms, taking project and group from the given room fields if present."""
+        index = cls(calculator)
+        for room in rooms:
+            index.add_room(room, str(room.get(project_field, '')), str(room.get(group_field, '')))
+        return index
+
+    def _rates(self, rates: Optional[Dict[str, float]]) -> Dict[str, float]:
+        return self.coverage_rates if rates is None else {**self.coverage_rates, **rates}
+
+    def price(self, rates: Optional[Dict[str, float]] = None) -> Dict[str, float]:
+        """
+        Litres per paint type for the whole portfolio.
+
+        Args:
+            rates: Coverage per 100 m² overriding the current table for the given paint types.
+                Paint types with no rate (unknown to the calculator) give 0 liters.
+        """
+        rates = self._rates(rates)
+        return {paint_type: area * rates.get(paint_type, 0) / 100 for paint_type, area in self.by_type.items()}
+
+    def price_by_project(self, rates: Optional[Dict[str, float]] = None) -> Dict[Tuple[str, str], float]:
+        """Litres per (project, paint type)."""
+        rates = self._rates(rates)
+        return {key: area * rates.get(key[-1], 0) / 100 for key, area in self.by_project.items()}
+
+    def price_by_group(self, rates: Optional[Dict[str, float]] = None) -> Dict[Tuple[str, str, str], float]:
+        """Litres per (project, group, paint type)."""
+        rates = self._rates(rates)
+        return {key: area * rates.get(key[-1], 0) / 100 for key, area in self.by_group.items()}
+
+    def what_if(self, rates: Dict[str, float]) -> Dict[str, Tuple[float, float, float]]:
+        """
+        Compare the current rate table with an alternative one.
+
+        Args:
+            rates: Alternative coverage per 100 m² for some or all paint types.
+
+        Returns:
+            Dict[str, Tuple[float, float, float]]: Per paint type (current liters, what-if liters, change).
+        """
+        current, alternative = self.price(), self.price(rates)
+        return {paint_type: (current[paint_type], alternative[paint_type], alternative[paint_type] - current[paint_type])
+                for paint_type in current}
+
+    def update_rates(self, rates: Dict[str, float]) -> None:
+        """Adopt new supplier coverage figures as the current table."""
+        self.coverage_rates.update(rates)
@@ -0,0 +1,316 @@
+#  madakixo
+## Batch estimation over room inventories (CSV or JSONL) using the same
+## PaintCalculator as the interactive scripts. Long runs write a checkpoint
+## periodically so they can resume exactly where they stopped.
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from fixed_point import FixedPointCalculator, ml_to_litres
+from paint_1 import PaintCalculator
+
+Room = Dict[str, Union[str, float, List[float]]]
+Result = Tuple[str, str, float]
+
+ROOM_FIELDS: List[str] = ['room_name', 'perimeter', 'height', 'window_areas', 'door_areas', 'paint_type']
+RESULT_FIELDS: List[str] = ['room_name', 'paint_type', 'litres']
+
+
+def parse_areas(value: Union[str, List[float], None]) -> List[float]:
+    """Parse a ';'-separated list of opening areas (CSV) or pass a JSON list through."""
+    if value is None or value == '':
+        return []
+    if isinstance(value, list):
+        return [float(v) for v in value]
+    return [float(v) for v in str(value).split(';') if v.strip()]
+
+
+def format_areas(areas: List[float]) -> str:
+    """Inverse of parse_areas for CSV output."""
+    return ';'.join(repr(float(a)) for a in areas)
+
+
+def normalise_room(record: Dict) -> Room:
+    """Convert a raw CSV/JSON record into a room with typed fields. Extra columns are kept as-is."""
+    room: Room = dict(record)
+    room['room_name'] = str(record.get('room_name', ''))
+    room['perimeter'] = float(record['perimeter'])
+    room['height'] = float(record['height'])
+    room['window_areas'] = parse_areas(record.get('window_areas'))
+    room['door_areas'] = parse_areas(record.get('door_areas'))
+    room['paint_type'] = str(record.get('paint_type') or 'Emulsion paint')
+    return room
+
+
+def read_csv_rooms(path: str, start: int = 0) -> Iterator[Room]:
+    """Stream rooms from a CSV file with a header row, skipping the first `start` rooms."""
+    with open(path, newline='', encoding='utf-8') as f:
+        for record in islice(csv.DictReader(f), start, None):
+            yield normalise_room(record)
+
+
+def read_jsonl_rooms(path: str, start: int = 0) -> Iterator[Room]:
+    """Stream rooms from a JSON Lines file, skipping the first `start` rooms."""
+    with open(path, encoding='utf-8') as f:
+        records = (json.loads(line) for line in f if line.strip())
+        for record in islice(records, start, None):
+            yield normalise_room(record)
+
+
+def read_xlsx_rooms(path: str, start: int = 0) -> Iterator[Room]:
+    """Stream rooms from an .xlsx workbook with the default column headers (see xlsx_import.py)."""
+    from xlsx_import import read_xlsx_rooms as read_workbook
+    return read_workbook(path, start)
+
+
+READERS: Dict[str, Callable[[str, int], Iterator[Room]]] = {
+    '.csv': read_csv_rooms,
+    '.jsonl': read_jsonl_rooms,
+    '.xlsx': read_xlsx_rooms,
+}
+
+
+def read_rooms(path: str, start: int = 0) -> Iterator[Room]:
+    """Stream rooms from any supported input format, chosen by file extension."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in READERS:
+        raise ValueError(f"Unsupported input format '{ext}'. Supported: {', '.join(sorted(READERS))}")
+    return READERS[ext](path, start)
+
+
+def write_csv_rooms(path: str, rooms: Iterable[Room]) -> int:
+    """Write rooms to CSV (opening areas ';'-separated), streaming. Returns the number written."""
+    count = 0
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer: Optional[csv.DictWriter] = None
+        for room in rooms:
+            if writer is None:
+                writer = csv.DictWriter(f, fieldnames=ROOM_FIELDS + [k for k in room if k not in ROOM_FIELDS])
+                writer.writeheader()
+            writer.writerow({**room, 'window_areas': format_areas(room['window_areas']),
+                             'door_areas': format_areas(room['door_areas'])})
+            count += 1
+    return count
+
+
+def write_jsonl_rooms(path: str, rooms: Iterable[Room]) -> int:
+    """Write rooms as JSON Lines, streaming. Returns the number written."""
+    count = 0
+    with open(path, 'w', encoding='utf-8') as f:
+        for room in rooms:
+            f.write(json.dumps(room) + '\n')
+            count += 1
+    return count
+
+
+def write_xlsx_rooms(path: str, rooms: Iterable[Room]) -> int:
+    """
+    Write rooms to an .xlsx workbook with the default column headers (see xlsx_import.py),
+    opening areas ';'-separated, streaming. Needs openpyxl. Returns the number written.
+    """
+    from openpyxl import Workbook
+    from xlsx_import import DEFAULT_COLUMNS
+
+    workbook = Workbook(write_only=True)
+    worksheet = workbook.create_sheet()
+    count = 0
+    fields: Optional[List[str]] = None
+    for room in rooms:
+        if fields is None:
+            fields = ROOM_FIELDS + [k for k in room if k not in ROOM_FIELDS]
+            worksheet.append([DEFAULT_COLUMNS.get(field, field) for field in fields])
+        row = {**room, 'window_areas': format_areas(room['window_areas']), 'door_areas': format_areas(room['door_areas'])}
+        worksheet.append([row.get(field) for field in fields])
+        count += 1
+    if fields is None:
+        worksheet.append([DEFAULT_COLUMNS[field] for field in ROOM_FIELDS])
+    workbook.save(path)
+    return count
+
+
+WRITERS: Dict[str, Callable[[str, Iterable[Room]], int]] = {
+    '.csv': write_csv_rooms,
+    '.jsonl': write_jsonl_rooms,
+    '.xlsx': write_xlsx_rooms,
+}
+
+
+def write_rooms(path: str, rooms: Iterable[Room]) -> int:
+    """Write rooms in any supported format, chosen by file extension."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in WRITERS:
+        raise ValueError(f"Unsupported output format '{ext}'. Supported: {', '.join(sorted(WRITERS))}")
+    return WRITERS[ext](path, rooms)
+
+
+def count_rooms(path: str) -> int:
+    """Count the rooms in an input file without parsing them (used for progress/ETA)."""
+    if path.lower().endswith('.xlsx'):
+        from xlsx_import import count_xlsx_rooms
+        return count_xlsx_rooms(path)
+    with open(path, 'rb') as f:
+        lines = sum(1 for line in f if line.strip())
+    return lines - 1 if path.lower().endswith('.csv') else lines
+
+
+def estimate_rooms(calculator: Union[PaintCalculator, FixedPointCalculator], rooms: Iterable[Room],
+                   in_ml: bool = False) -> Iterator[Result]:
+    """
+    Run each room through calculate_paint_requirement and yield (room_name, paint_type, litres).
+
+    With `in_ml`, the calculator must be a FixedPointCalculator and the third item is integer mL.
+    """
+    calculate = calculator.calculate_paint_requirement_ml if in_ml else calculator.calculate_paint_requirement
+    for room in rooms:
+        amount = calculate(room['room_name'], room['perimeter'], room['height'],
+                           room['window_areas'], room['door_areas'], room['paint_type'])
+        yield room['room_name'], room['paint_type'], amount
+
+
+def print_progress(done: int, total: Optional[int], elapsed: float) -> None:
+    """Default progress reporter: rooms done, throughput and ETA on stderr."""
+    rate = done / elapsed if elapsed > 0 else 0.0
+    if total and rate:
+        eta = time.strftime('%H:%M:%S', time.gmtime((total - done) / rate))
+        print(f"{done:,}/{total:,} rooms ({100 * done / total:.1f}%) {rate:,.0f} rooms/s ETA {eta}", file=sys.stderr)
+    else:
+        print(f"{done:,} rooms {rate:,.0f} rooms/s", file=sys.stderr)
+
+
+class BatchEstimator:
+    """Estimates paint for a whole inventory file, with optional checkpoint/resume."""
+
+    def __init__(self, calculator: Optional[PaintCalculator] = None, checkpoint_every: int = 50000,
+                 progress: Optional[Callable[[int, Optional[int], float], None]] = print_progress,
+                 progress_interval: float = 5.0, fixed_point: bool = False):
+        """
+        Args:
+            calculator: Calculator used for every room (a new PaintCalculator by default).
+            checkpoint_every: Rooms processed between checkpoints.
+            progress: Called as progress(done, total, elapsed_seconds); None disables reporting.
+            progress_interval: Minimum seconds between progress reports.
+            fixed_point: Work in integer mL (see fixed_point.py) so totals are exact and order independent.
+        """
+        self.calculator = calculator or PaintCalculator()
+        self.fixed_point = fixed_point
+        if fixed_point:
+            self.calculator = FixedPointCalculator(self.calculator)
+        self.checkpoint_every = checkpoint_every
+        self.progress = progress
+        self.progress_interval = progress_interval
+
+    @staticmethod
+    def load_checkpoint(checkpoint_path: Optional[str]) -> Optional[Dict]:
+        """Return the saved checkpoint state, or None if there is none."""
+        if not checkpoint_path or not os.path.exists(checkpoint_path):
+            return None
+        with open(checkpoint_path, encoding='utf-8') as f:
+            return json.load(f)
+
+    @staticmethod
+    def save_checkpoint(checkpoint_path: str, state: Dict) -> None:
+        """Atomically replace the checkpoint file with `state`."""
+        tmp_path = checkpoint_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, checkpoint_path)
+
+    def run(self, input_path: str, output_path: str, checkpoint_path: Optional[str] = None,
+            resume: bool = True, reader: Optional[Callable[[str, int], Iterator[Room]]] = None) -> Dict[str, float]:
+        """
+        Estimate every room in `input_path`, writing per-room results to `output_path` (CSV).
+
+        Every `checkpoint_every` rooms the input offset, the per-paint-type totals and the
+        byte position of the output file are saved to `checkpoint_path`. A later run with
+        the same paths resumes from that point and produces identical totals. In fixed-point
+        mode the totals are accumulated as integer mL and only converted to litres on return.
+
+        `reader(path, start)` replaces the reader chosen by file extension, e.g. to pass
+        custom column mappings to xlsx_import.read_xlsx_rooms.
+
+        Returns:
+            Dict[str, float]: Total litres per paint type.
+        """
+        state = self.load_checkpoint(checkpoint_path) if resume else None
+        if state is not None and state.get('input_path') != os.path.abspath(input_path):
+            raise ValueError(f"Checkpoint {checkpoint_path} belongs to a different input file.")
+        if state is not None and state.get('fixed_point', False) != self.fixed_point:
+            # Totals are litres (float) or mL (int); resuming in the other mode would mix the units.
+            mode = 'fixed-point (mL)' if state.get('fixed_point', False) else 'floating-point (litres)'
+            raise ValueError(f"Checkpoint {checkpoint_path} was written by a {mode} run; resume in the same mode or restart.")
+        offset: int = state['input_offset'] if state else 0
+        totals: Dict[str, Union[int, float]] = dict(state['totals']) if state else {}
+
+        total_rooms = count_rooms(input_path) if self.progress else None
+        started = last_report = time.monotonic()
+        done_this_run = 0
+
+        mode = 'r+' if state else 'w'
+        with open(output_path, mode, newline='', encoding='utf-8') as out:
+            if state:
+                # Drop anything written after the last checkpoint.
+                out.seek(state['output_position'])
+                out.truncate()
+            writer = csv.writer(out)
+            if not state:
+                writer.writerow(RESULT_FIELDS)
+
+            def checkpoint() -> None:
+                out.flush()
+                os.fsync(out.fileno())
+                self.save_checkpoint(checkpoint_path, {
+                    'input_path': os.path.abspath(input_path),
+                    'input_offset': offset,
+                    'output_position': out.tell(),
+                    'totals': totals,
+                    'fixed_point': self.fixed_point,
+                })
+
+            rooms = (reader or read_rooms)(input_path, offset)
+            for room_name, paint_type, amount in estimate_rooms(self.calculator, rooms, self.fixed_point):
+                writer.writerow([room_name, paint_type, f"{ml_to_litres(amount):.3f}" if self.fixed_point else f"{amount:.2f}"])
+                totals[paint_type] = totals.get(paint_type, 0) + amount
+                offset += 1
+                done_this_run += 1
+                if checkpoint_path and offset % self.checkpoint_every == 0:
+                    checkpoint()
+                if self.progress and time.monotonic() - last_report >= self.progress_interval:
+                    last_report = time.monotonic()
+                    self.progress(offset, total_rooms, (last_report - started) * offset / done_this_run)
+
+            if checkpoint_path:
+                checkpoint()
+        if self.progress and done_this_run:
+            # Scale elapsed time so the reported rate reflects this run only, not resumed rooms.
+            self.progress(offset, total_rooms, (time.monotonic() - started) * offset / done_this_run)
+        if self.fixed_point:
+            return {paint_type: ml_to_litres(ml) for paint_type, ml in totals.items()}
+        return totals
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Estimate paint for every room in a CSV/JSONL inventory.")
+    parser.add_argument('input', help="Room inventory (.csv or .jsonl)")
+    parser.add_argument('output', help="Per-room results CSV")
+    parser.add_argument('--checkpoint', help="Checkpoint file; an existing one is resumed")
+    parser.add_argument('--checkpoint-every', type=int, default=50000)
+    parser.add_argument('--restart', action='store_true', help="Ignore any existing checkpoint")
+    parser.add_argument('--fixed-point', action='store_true', help="Integer mL arithmetic (exact, order independent totals)")
+    args = parser.parse_args()
+
+    estimator = BatchEstimator(checkpoint_every=args.checkpoint_every, fixed_point=args.fixed_point)
+    totals = estimator.run(args.input, args.output, args.checkpoint, resume=not args.restart)
+    for paint_type, litres in sorted(totals.items()):
+        print(f"{paint_type}: {litres:.2f} liters")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+#  madakixo
+## Differential equivalence harness: every accelerated path must reproduce the
+## reference PaintCalculator.calculate_paint_requirement (paint_1.py). Millions of
+## random and edge-case rooms (zero and negative net area, unknown paint types,
+## rooms with hundreds of openings) are generated as NumPy arrays. A sample is run
+## through the scalar reference to validate a vectorised oracle of the same
+## formula; the oracle then checks each fast path on the full set in seconds.
+##
+##   python equivalence.py --rooms 2000000 --seed 1
+
+import argparse
+import contextlib
+import gzip
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from area_index import AreaIndex
+from batch_estimate import BatchEstimator, write_rooms
+from fixed_point import FixedPointCalculator
+from frozen_calculator import FrozenPaintCalculator, RateTable, ThreadPoolEstimator
+from paint_1 import PaintCalculator
+from pipeline_ingest import IngestPipeline
+from ragged import DOOR, WINDOW, Openings, calculate_ragged, opening_totals_cm2
+from templates import Instance, TemplateEstimator
+
+UNKNOWN_PAINT: str = 'Unknown paint'
+ROOM_FIELDS = ('perimeter', 'height', 'window_areas', 'door_areas', 'paint_type')
+# Float paths must agree to this relative/absolute tolerance (in litres).
+FLOAT_RTOL: float = 1e-12
+FLOAT_ATOL: float = 1e-12
+
+
+class Rooms(NamedTuple):
+    """Generated rooms as columns, with their openings in CSR form."""
+    perimeter: np.ndarray
+    height: np.ndarray
+    paint_types: List[str]
+    codes: np.ndarray
+    openings: Openings
+
+    def __len__(self) -> int:
+        return len(self.perimeter)
+
+    def opening_room(self) -> np.ndarray:
+        """Room index of every opening."""
+        return np.repeat(np.arange(len(self)), self.openings.counts())
+
+    def totals(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Window and door totals per room, summed left to right like Python's sum()."""
+        rooms = self.opening_room()
+        doors = self.openings.kinds == DOOR
+        areas = self.openings.areas
+        window_total = np.bincount(rooms[~doors], weights=areas[~doors], minlength=len(self))
+        door_total = np.bincount(rooms[doors], weights=areas[doors], minlength=len(self))
+        return window_total, door_total
+
+    def room(self, i: int) -> Tuple[float, float, List[float], List[float], str]:
+        """Room i as arguments for calculate_paint_requirement (after room_name)."""
+        windows, doors = self.openings.room(i)
+        return (float(self.perimeter[i]), float(self.height[i]), windows, doors,
+                self.paint_types[self.codes[i]] if self.codes[i] >= 0 else UNKNOWN_PAINT)
+
+
+def generate_rooms(count: int, seed: int = 0, table: Optional[RateTable] = None) -> Rooms:
+    """
+    Random rooms with edge cases mixed in: ~5% with exactly zero net area, ~5% negative,
+    ~5% unknown paint type, ~2% with 100-500 openings and ~1% with zero perimeter or height.
+    """
+    rng = np.random.default_rng(seed)
+    table = table or RateTable()
+    paint_types = list(table.rates)
+    scale = 10.0 ** rng.integers(1, 4, count)  # perimeters to 1-3 decimal places
+    perimeter = np.round(rng.uniform(1, 40, count) * scale) / scale
+    height = rng.uniform(2.2, 6, count).round(2)
+    codes = rng.integers(0, len(paint_types), count)
+    kind = rng.random(count)
+    zero_net, negative, unknown, many = kind < 0.05, (kind >= 0.05) & (kind < 0.10), (kind >= 0.10) & (kind < 0.15), kind >= 0.98
+    degenerate = rng.random(count) < 0.01
+    perimeter[degenerate & (rng.random(count) < 0.5)] = 0.0
+    height[degenerate & (perimeter > 0)] = 0.0
+    codes[unknown] = -1
+
+    counts = np.where(many, rng.integers(100, 501, count), rng.poisson(3, count))
+    counts[zero_net] = 1
+    offsets = np.concatenate(([0], np.cumsum(counts))).astype(np.int64)
+    opening_areas = rng.uniform(0.1, 4, offsets[-1]).round(3)
+    opening_is_door = rng.random(offsets[-1]) < 0.35
+    rooms = np.repeat(np.arange(count), counts)
+    # Zero net area: one window covering the wall exactly (p*h - p*h - 0 == 0).
+    first = offsets[:-1][zero_net]
+    opening_areas[first] = perimeter[zero_net] * height[zero_net]
+    opening_is_door[first] = False
+    # Negative net area: openings well beyond the wall area.
+    opening_areas[negative[rooms]] *= 50
+    kinds = np.where(opening_is_door, DOOR, WINDOW).astype(np.int8)
+    return Rooms(perimeter, height, paint_types, codes, Openings(offsets, opening_areas, kinds))
+
+
+def oracle(rooms: Rooms, table: RateTable) -> np.ndarray:
+    """The reference formula written directly over the columns (independent of the fast paths)."""
+    window_total, door_total = rooms.totals()
+    net = rooms.perimeter * rooms.height - window_total - door_total
+    rates = np.array([table.rates[p] for p in rooms.paint_types] + [0.0])[rooms.codes]
+    litres = (net * rates) / 100
+    return np.where((net > 0) & (rooms.codes >= 0), litres, 0.0)
+
+
+def scalar_reference(rooms: Rooms, indices: np.ndarray, calculator: PaintCalculator) -> np.ndarray:
+    """calculate_paint_requirement for the given rooms, with its error printing silenced."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return np.array([calculator.calculate_paint_requirement('room', *rooms.room(i)) for i in indices], dtype=np.float64)
+
+
+def fixed_point_bound(rooms: Rooms, table: RateTable) -> np.ndarray:
+    """
+    Worst-case difference (litres) allowed for the fixed-point path: half a millimetre on
+    perimeter and height, half a cm² on the wall and on every opening, half a millilitre.
+    """
+    counts = rooms.openings.counts()
+    area_error = 0.0005 * (rooms.perimeter + rooms.height) + 0.0005 ** 2 + 0.5e-4 * (counts + 1)
+    rates = np.array([table.rates[p] for p in rooms.paint_types] + [0.0])[rooms.codes]
+    return area_error * rates / 100 + 0.0005 + 1e-12
+
+
+class Check(NamedTuple):
+    name: str
+    cases: int
+    failures: int
+    max_error: float
+    first_failure: int
+    seconds: float
+
+
+def _compare(name: str, expected: np.ndarray, actual: np.ndarray, tolerance: np.ndarray, seconds: float) -> Check:
+    error = np.abs(actual - expected)
+    bad = np.flatnonzero(error > tolerance)
+    return Check(name, len(expected), len(bad), float(error.max(initial=0.0)), int(bad[0]) if len(bad) else -1, seconds)
+
+
+def _pipeline_totals(sample_rooms: List[Dict], table: RateTable) -> Dict[str, float]:
+    """Totals from IngestPipeline after a round trip through a gzipped JSONL archive."""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'rooms.jsonl.gz')
+        with gzip.open(path, 'wt', encoding='utf-8') as f:
+            for room in sample_rooms:
+                f.write(json.dumps(room) + '\n')
+        totals, _ = IngestPipeline(FrozenPaintCalculator(table)).run(path)
+    return totals
+
+
+def _batch_totals(named_rooms: List[Dict], fixed_point: bool = False) -> Dict[str, float]:
+    """Totals from BatchEstimator.run over the rooms written to a CSV inventory."""
+    with tempfile.TemporaryDirectory() as directory:
+        input_path, output_path = os.path.join(directory, 'rooms.csv'), os.path.join(directory, 'results.csv')
+        write_rooms(input_path, named_rooms)
+        with contextlib.redirect_stdout(io.StringIO()):
+            return BatchEstimator(progress=None, fixed_point=fixed_point).run(input_path, output_path)
+
+
+def _template_totals(named_rooms: List[Dict]) -> Dict[str, float]:
+    """Totals from TemplateEstimator with the rooms as one template used once."""
+    estimator = TemplateEstimator()
+    estimator.add_template('sample', named_rooms)
+    with contextlib.redirect_stdout(io.StringIO()):
+        return estimator.estimate([Instance('sample')])
+
+
+def run_checks(count: int = 1_000_000, seed: int = 0, scalar_sample: int = 100_000) -> List[Check]:
+    """Generate rooms and check every accelerated path; returns one Check per path."""
+    table = RateTable()
+    rooms = generate_rooms(count, seed, table)
+    checks: List[Check] = []
+
+    started = time.perf_counter()
+    expected = oracle(rooms, table)
+    float_tol = FLOAT_ATOL + FLOAT_RTOL * np.abs(expected)
+
+    # 1. The oracle itself against the scalar reference on a random sample.
+    sample = np.random.default_rng(seed + 1).choice(count, min(scalar_sample, count), replace=False)
+    reference = scalar_reference(rooms, sample, PaintCalculator())
+    checks.append(_compare('oracle vs scalar reference', reference, expected[sample], float_tol[sample],
+                           time.perf_counter() - started))
+
+    window_total, door_total = rooms.totals()
+    paths: Dict[str, Callable[[], np.ndarray]] = {
+        'FrozenPaintCalculator.calculate_arrays': lambda: FrozenPaintCalculator(table).calculate_arrays(
+            rooms.perimeter, rooms.height, window_total, door_total, rooms.codes),
+        'ThreadPoolEstimator (4 threads)': lambda: ThreadPoolEstimator(FrozenPaintCalculator(table), 4).estimate_arrays(
+            rooms.perimeter, rooms.height, window_total, door_total, rooms.codes),
+        'ragged.calculate_ragged (CSR openings)': lambda: calculate_ragged(
+            rooms.perimeter, rooms.height, rooms.openings, rooms.codes, FrozenPaintCalculator(table)),
+    }
+    for name, path in paths.items():
+        started = time.perf_counter()
+        checks.append(_compare(name, expected, path(), float_tol, time.perf_counter() - started))
+
+    # 2. Fixed-point: integer inputs rounded the way FixedPointCalculator rounds them.
+    started = time.perf_counter()
+    fixed = FixedPointCalculator()
+    opening_cm2 = opening_totals_cm2(rooms.openings)
+    coverage = fixed.coverage_array(rooms.paint_types + [UNKNOWN_PAINT])[np.where(rooms.codes < 0, len(rooms.paint_types), rooms.codes)]
+    ml = fixed.calculate_ml_arrays(np.round(rooms.perimeter * 1000).astype(np.int64),
+                                   np.round(rooms.height * 1000).astype(np.int64), opening_cm2, coverage)
+    checks.append(_compare('FixedPointCalculator.calculate_ml_arrays', expected, ml / 1000,
+                           fixed_point_bound(rooms, table), time.perf_counter() - started))
+
+    # 3. Scalar fast paths and aggregations over room dicts, on the sample.
+    started = time.perf_counter()
+    frozen = FrozenPaintCalculator(table)
+    sample_rooms = [dict(zip(ROOM_FIELDS, rooms.room(i))) for i in sample]
+    actual = np.array([frozen.calculate_paint_requirement('room', **room) for room in sample_rooms])
+    checks.append(_compare('FrozenPaintCalculator.calculate_paint_requirement', reference, actual, float_tol[sample],
+                           time.perf_counter() - started))
+
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        sample_ml = np.array([fixed.calculate_paint_requirement_ml('room', **room) for room in sample_rooms], dtype=np.int64)
+    checks.append(_compare('FixedPointCalculator.calculate_paint_requirement_ml', reference, sample_ml / 1000,
+                           fixed_point_bound(rooms, table)[sample], time.perf_counter() - started))
+
+    n_types = len(rooms.paint_types)
+    codes = np.where(rooms.codes[sample] < 0, n_types, rooms.codes[sample])
+    per_type = np.bincount(codes, weights=reference, minlength=n_types + 1)[:n_types]
+    total_tol = 1e-9 * per_type + 1e-9
+    # Unique room names, as the batch inventory and templates expect.
+    named_rooms = [{'room_name': f'room {i}', **room} for i, room in enumerate(sample_rooms)]
+    aggregations: Dict[str, Callable[[], Dict[str, float]]] = {
+        'AreaIndex.price': lambda: AreaIndex.from_rooms(sample_rooms).price(),
+        'IngestPipeline.run (.jsonl.gz)': lambda: _pipeline_totals(sample_rooms, table),
+        'BatchEstimator.run (.csv)': lambda: _batch_totals(named_rooms),
+        'TemplateEstimator.estimate': lambda: _template_totals(named_rooms),
+    }
+    for name, path in aggregations.items():
+        started = time.perf_counter()
+        totals = path()
+        checks.append(_compare(f'{name} (litres per paint type)', per_type,
+                               np.array([totals.get(p, 0.0) for p in rooms.paint_types]), total_tol,
+                               time.perf_counter() - started))
+
+    # Fixed-point totals are sums of whole mL, so they must match the scalar mL path exactly.
+    started = time.perf_counter()
+    totals = _batch_totals(named_rooms, fixed_point=True)
+    per_type_ml = np.bincount(codes, weights=sample_ml, minlength=n_types + 1)[:n_types]
+    checks.append(_compare('BatchEstimator(fixed_point=True).run (.csv, litres per paint type)', per_type_ml / 1000,
+                           np.array([totals.get(p, 0.0) for p in rooms.paint_types]), np.full(n_types, 1e-12),
+                           time.perf_counter() - started))
+    return checks
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Check accelerated paint calculation paths against the reference.")
+    parser.add_argument('--rooms', type=int, default=1_000_000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--scalar-sample', type=int, default=100_000, help="Rooms run through the scalar reference")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    checks = run_checks(args.rooms, args.seed, args.scalar_sample)
+    for check in checks:
+        status = 'ok  ' if check.failures == 0 else 'FAIL'
+        line = f"{status} {check.name}: {check.cases:,} cases, max error {check.max_error:.3g} L, {check.seconds:.2f}s"
+        if check.failures:
+            line += f", {check.failures:,} outside tolerance (first at index {check.first_failure})"
+        print(line)
+    print(f"Total {time.perf_counter() - started:.2f}s")
+    sys.exit(1 if any(check.failures for check in checks) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#  madakixo
+## Integer fixed-point version of the paint calculation: lengths in millimetres,
+## areas in square centimetres and paint in millilitres. Integer sums do not
+## depend on chunking or worker order, so totals are bit-identical however a
+## portfolio is split up.
+
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from paint_1 import PaintCalculator
+
+CM2_PER_100M2: int = 100 * 10000
+
+
+def to_mm(metres: float) -> int:
+    """Convert a length in metres to whole millimetres."""
+    return int(round(metres * 1000))
+
+
+def to_cm2(square_metres: float) -> int:
+    """Convert an area in m² to whole cm²."""
+    return int(round(square_metres * 10000))
+
+
+def to_ml(litres: float) -> int:
+    """Convert litres to whole millilitres."""
+    return int(round(litres * 1000))
+
+
+def ml_to_litres(ml: int) -> float:
+    """Convert millilitres back to litres for display."""
+    return ml / 1000
+
+
+def wall_area_cm2(perimeter_mm: int, height_mm: int) -> int:
+    """Gross wall area in cm², rounded half-up from mm²."""
+    return (perimeter_mm * height_mm + 50) // 100
+
+
+def paint_ml(net_area_cm2: int, coverage_ml_per_100m2: int) -> int:
+    """Paint in mL for a net area, rounded half-up to the nearest mL."""
+    return (net_area_cm2 * coverage_ml_per_100m2 + CM2_PER_100M2 // 2) // CM2_PER_100M2
+
+
+class FixedPointCalculator:
+    """PaintCalculator counterpart that works entirely in integers."""
+
+    def __init__(self, calculator: Optional[PaintCalculator] = None):
+        """Build the integer coverage table (mL per 100 m²) from a PaintCalculator's rates."""
+        calculator = calculator or PaintCalculator()
+        # 7 + 6.65 + 6.3 or 6.25 * 3 carry binary rounding error as floats; as mL they are exact.
+        self.coverage_ml: Dict[str, int] = {name: to_ml(rate) for name, rate in calculator.coverage_rates.items()}
+
+    def calculate_paint_requirement_ml(self, room_name: str, perimeter: float, height: float, window_areas: List[float], door_areas: List[float], paint_type: str) -> int:
+        """
+        Calculate paint requirement for a room in whole millilitres.
+
+        Takes the same arguments (in metres and m²) as PaintCalculator.calculate_paint_requirement
+        and follows its error handling: a negative net area or an unknown paint type prints an
+        error and gives 0.
+
+        Returns:
+            int: Paint required in millilitres.
+        """
+        try:
+            net_area_cm2 = (wall_area_cm2(to_mm(perimeter), to_mm(height))
+                            - sum(to_cm2(a) for a in window_areas) - sum(to_cm2(a) for a in door_areas))
+            if net_area_cm2 < 0:
+                raise ValueError("Net wall area cannot be negative.")
+            coverage = self.coverage_ml.get(paint_type)
+            if coverage is None:
+                raise KeyError(f"Paint type {paint_type} not found.")
+            return paint_ml(net_area_cm2, coverage)
+        except (ValueError, KeyError) as e:
+            print(f"Error: {e}")
+            return 0
+
+    def calculate_paint_requirement(self, room_name: str, perimeter: float, height: float, window_areas: List[float], door_areas: List[float], paint_type: str) -> float:
+        """Same as calculate_paint_requirement_ml, returned in litres."""
+        return ml_to_litres(self.calculate_paint_requirement_ml(room_name, perimeter, height, window_areas, door_areas, paint_type))
+
+    def coverage_array(self, paint_types: List[str]) -> np.ndarray:
+        """Coverage in mL per 100 m² for each name in `paint_types`, -1 where unknown."""
+        return np.array([self.coverage_ml.get(p, -1) for p in paint_types], dtype=np.int64)
+
+    @staticmethod
+    def calculate_ml_arrays(perimeter_mm: np.ndarray, height_mm: np.ndarray, openings_cm2: np.ndarray, coverage_ml: np.ndarray) -> np.ndarray:
+        """
+        Vectorised calculate_paint_requirement_ml over whole columns of rooms.
+
+        Args:
+            perimeter_mm: Perimeter of each room in mm.
+            height_mm: Height of each room in mm.
+            openings_cm2: Total window and door area of each room in cm².
+            coverage_ml: Coverage of each room's paint type in mL per 100 m² (-1 for unknown).
+
+        Returns:
+            np.ndarray: int64 paint per room in mL, 0 where the net area is negative or the paint unknown.
+        """
+        net = (perimeter_mm.astype(np.int64) * height_mm + 50) // 100 - openings_cm2
+        ml = (net * coverage_ml + CM2_PER_100M2 // 2) // CM2_PER_100M2
+        return np.where((net >= 0) & (coverage_ml >= 0), ml, 0)
+
+
+def total_ml_by_type(paint_codes: np.ndarray, ml: np.ndarray, n_types: int) -> np.ndarray:
+    """Sum per-room mL into one int64 total per paint-type code (exact, order independent)."""
+    totals = np.zeros(n_types, dtype=np.int64)
+    np.add.at(totals, paint_codes, ml)
+    return totals
+
+
+def merge_totals(shards: Iterable[Dict[str, int]]) -> Dict[str, int]:
+    """Combine per-shard mL totals; the result is identical for any shard split or order."""
+    merged: Dict[str, int] = {}
+    for shard in shards:
+        for paint_type, ml in shard.items():
+            merged[paint_type] = merged.get(paint_type, 0) + ml
+    return merged
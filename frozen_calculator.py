@@ -0,0 +1,167 @@
+#  madakixo
+## Thread-safe calculator for embedding in threaded servers. RateTable is an
+## immutable snapshot of the coverage rates and FrozenPaintCalculator cannot be
+## modified after construction, so one instance can be shared by every thread.
+## Invalid rooms give 0 liters like PaintCalculator, but without printing; pass
+## strict=True to get the ValueError/KeyError instead. ThreadPoolEstimator splits
+## NumPy column arrays across a thread pool; NumPy releases the GIL inside its
+## array operations, so the slices are computed in parallel.
+
+import argparse
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from paint_1 import PaintCalculator
+
+
+class RateTable:
+    """Immutable snapshot of coverage rates (liters per 100 m² for 3 coats)."""
+
+    __slots__ = ('_rates', '_names', '_array')
+
+    def __init__(self, rates: Optional[Mapping[str, float]] = None):
+        rates = dict(PaintCalculator().coverage_rates if rates is None else rates)
+        object.__setattr__(self, '_rates', MappingProxyType(rates))
+        object.__setattr__(self, '_names', {name: i for i, name in enumerate(rates)})
+        array = np.array(list(rates.values()) + [0.0], dtype=np.float64)
+        array.flags.writeable = False
+        object.__setattr__(self, '_array', array)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("RateTable is immutable; use with_rates() to derive a new table.")
+
+    @property
+    def rates(self) -> Mapping[str, float]:
+        return self._rates
+
+    def with_rates(self, changes: Mapping[str, float]) -> 'RateTable':
+        """A new table with some rates changed or added; this one is left untouched."""
+        return RateTable({**self._rates, **changes})
+
+    def codes(self, paint_types: Iterable[str]) -> np.ndarray:
+        """Index of each paint type in the table, -1 for unknown types."""
+        return np.fromiter((self._names.get(p, -1) for p in paint_types), dtype=np.int64)
+
+    def rate_array(self, codes: np.ndarray) -> np.ndarray:
+        """Rate for each code; unknown (-1) maps to the trailing 0."""
+        return self._array[codes]
+
+
+class FrozenPaintCalculator:
+    """Immutable, shareable counterpart of PaintCalculator."""
+
+    __slots__ = ('table',)
+
+    def __init__(self, table: Optional[RateTable] = None):
+        object.__setattr__(self, 'table', table or RateTable())
+
+    def __setattr__(self, name, value):
+        raise AttributeError("FrozenPaintCalculator is immutable; build a new one from a new RateTable.")
+
+    @property
+    def coverage_rates(self) -> Mapping[str, float]:
+        """Read-only view of the rates, so code written for PaintCalculator can read them."""
+        return self.table.rates
+
+    def calculate_paint_requirement(self, room_name: str, perimeter: float, height: float, window_areas: List[float], door_areas: List[float], paint_type: str, strict: bool = False) -> float:
+        """
+        Calculate paint requirement for a room; same formula as PaintCalculator.
+
+        Returns:
+            float: Paint required in liters (0 for an invalid room unless `strict`).
+
+        Raises:
+            ValueError, KeyError: Only when `strict` is True.
+        """
+        net_wall_area = perimeter * height - sum(window_areas) - sum(door_areas)
+        coverage_per_100m2 = self.table.rates.get(paint_type)
+        if net_wall_area < 0 or coverage_per_100m2 is None:
+            if strict:
+                if net_wall_area < 0:
+                    raise ValueError("Net wall area cannot be negative.")
+                raise KeyError(f"Paint type {paint_type} not found.")
+            return 0
+        return (net_wall_area * coverage_per_100m2) / 100 if net_wall_area > 0 else 0
+
+    def calculate_arrays(self, perimeter: np.ndarray, height: np.ndarray, window_total: np.ndarray,
+                         door_total: np.ndarray, codes: np.ndarray) -> np.ndarray:
+        """
+        Vectorised calculate_paint_requirement over columns of rooms.
+
+        Window and door totals are kept separate so the subtraction order, and therefore every
+        bit of the result, matches the scalar formula.
+        """
+        net = perimeter * height - window_total - door_total
+        litres = net * self.table.rate_array(codes) / 100
+        return np.where((net > 0) & (codes >= 0), litres, 0.0)
+
+
+class ThreadPoolEstimator:
+    """Runs FrozenPaintCalculator.calculate_arrays over slices of large columns on a thread pool."""
+
+    def __init__(self, calculator: Optional[FrozenPaintCalculator] = None, workers: int = 4, slice_size: int = 1 << 18):
+        self.calculator = calculator or FrozenPaintCalculator()
+        self.workers = workers
+        self.slice_size = slice_size
+
+    def estimate_arrays(self, perimeter: np.ndarray, height: np.ndarray, window_total: np.ndarray,
+                        door_total: np.ndarray, codes: np.ndarray) -> np.ndarray:
+        """Litres per room, computed slice by slice on the pool."""
+        out = np.empty(len(perimeter), dtype=np.float64)
+
+        def work(start: int) -> None:
+            stop = start + self.slice_size
+            out[start:stop] = self.calculator.calculate_arrays(
+                perimeter[start:stop], height[start:stop], window_total[start:stop], door_total[start:stop], codes[start:stop])
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            list(pool.map(work, range(0, len(perimeter), self.slice_size)))
+        return out
+
+    def estimate_rooms(self, rooms: Sequence[Dict]) -> np.ndarray:
+        """Litres per room for a list of room dicts (as produced by batch_estimate.read_rooms)."""
+        return self.estimate_arrays(
+            np.fromiter((r['perimeter'] for r in rooms), dtype=np.float64, count=len(rooms)),
+            np.fromiter((r['height'] for r in rooms), dtype=np.float64, count=len(rooms)),
+            np.fromiter((sum(r['window_areas']) for r in rooms), dtype=np.float64, count=len(rooms)),
+            np.fromiter((sum(r['door_areas']) for r in rooms), dtype=np.float64, count=len(rooms)),
+            self.calculator.table.codes(r['paint_type'] for r in rooms))
+
+
+def benchmark(rooms: int = 5_000_000, max_workers: int = 8, repeat: int = 3) -> None:
+    """Time estimate_arrays with 1..max_workers threads on random columns and print the speed-ups."""
+    gil = getattr(sys, '_is_gil_enabled', lambda: True)()
+    print(f"Python {sys.version.split()[0]}, {'standard (GIL)' if gil else 'free-threaded'} build, NumPy {np.__version__}")
+    rng = np.random.default_rng(0)
+    table = RateTable()
+    columns = (rng.uniform(5, 20, rooms), rng.uniform(2.7, 3.6, rooms), rng.uniform(0, 4, rooms),
+               rng.uniform(0, 4, rooms), rng.integers(-1, len(table.rates), rooms))
+    baseline = None
+    workers = 1
+    while workers <= max_workers:
+        estimator = ThreadPoolEstimator(FrozenPaintCalculator(table), workers)
+        best = float('inf')
+        for _ in range(repeat):
+            started = time.perf_counter()
+            estimator.estimate_arrays(*columns)
+            best = min(best, time.perf_counter() - started)
+        baseline = baseline or best
+        print(f"{workers} thread(s): {best * 1000:.1f} ms, {rooms / best / 1e6:.1f}M rooms/s, speed-up {baseline / best:.2f}x")
+        workers *= 2
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the thread-pool estimator.")
+    parser.add_argument('--rooms', type=int, default=5_000_000)
+    parser.add_argument('--max-workers', type=int, default=8)
+    args = parser.parse_args()
+    benchmark(args.rooms, args.max_workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+#  madakixo
+## Positioned openings: windows and doors placed on a wall by their lower-left
+## corner, width and height. Overlapping or duplicated openings are counted once
+## (true union of area per wall) instead of being subtracted twice.
+
+from collections import defaultdict
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from paint_1 import PaintCalculator
+
+
+class Opening(NamedTuple):
+    """A window or door on a wall; x, y, width and height in meters."""
+    wall: str
+    x: float
+    y: float
+    width: float
+    height: float
+    kind: str = 'window'
+
+    @property
+    def area(self) -> float:
+        return self.width * self.height
+
+
+def union_area(openings: List[Opening]) -> float:
+    """
+    Area covered by the union of the openings (all assumed to be on the same wall).
+
+    Sweeps across x with a segment tree over the distinct y coordinates, so it runs in
+    O(n log n) however many of the openings overlap.
+    """
+    ys = sorted({o.y for o in openings} | {o.y + o.height for o in openings})
+    if len(ys) < 2:
+        return 0.0
+    y_index = {y: i for i, y in enumerate(ys)}
+    events = []
+    for o in openings:
+        if o.width <= 0 or o.height <= 0:
+            continue
+        events.append((o.x, 1, y_index[o.y], y_index[o.y + o.height]))
+        events.append((o.x + o.width, -1, y_index[o.y], y_index[o.y + o.height]))
+    events.sort()
+
+    segments = len(ys) - 1
+    count = [0] * (4 * segments)
+    covered = [0.0] * (4 * segments)
+
+    def update(node: int, lo: int, hi: int, start: int, stop: int, delta: int) -> None:
+        if stop <= lo or hi <= start:
+            return
+        if start <= lo and hi <= stop:
+            count[node] += delta
+        else:
+            mid = (lo + hi) // 2
+            update(2 * node, lo, mid, start, stop, delta)
+            update(2 * node + 1, mid, hi, start, stop, delta)
+        if count[node] > 0:
+            covered[node] = ys[hi] - ys[lo]
+        elif hi - lo == 1:
+            covered[node] = 0.0
+        else:
+            covered[node] = covered[2 * node] + covered[2 * node + 1]
+
+    area = 0.0
+    previous_x = events[0][0] if events else 0.0
+    for x, delta, start, stop in events:
+        area += covered[1] * (x - previous_x)
+        previous_x = x
+        update(1, 0, segments, start, stop, delta)
+    return area
+
+
+class OpeningIndex:
+    """Uniform grid index over the openings of each wall, used to find overlaps quickly."""
+
+    def __init__(self, openings: List[Opening], cell_size: Optional[float] = None):
+        """
+        Args:
+            openings: Openings on any number of walls.
+            cell_size: Grid cell size in meters (default: the median opening width/height,
+                so a typical opening touches only a few cells).
+        """
+        self.openings = list(openings)
+        if cell_size is None:
+            sizes = sorted(max(o.width, o.height) for o in self.openings) or [1.0]
+            cell_size = sizes[len(sizes) // 2] or 1.0
+        self.cell_size = cell_size
+        self.cells: Dict[Tuple[str, int, int], List[int]] = defaultdict(list)
+        for i, o in enumerate(self.openings):
+            if o.width <= 0 or o.height <= 0:
+                continue  # no area, so nothing to overlap (union_area skips them too)
+            for cell in self._cells_for(o):
+                self.cells[cell].append(i)
+
+    def _cells_for(self, o: Opening):
+        size = self.cell_size
+        for cx in range(int(o.x // size), int((o.x + o.width) // size) + 1):
+            for cy in range(int(o.y // size), int((o.y + o.height) // size) + 1):
+                yield o.wall, cx, cy
+
+    def overlaps(self) -> List[Tuple[int, int]]:
+        """Index pairs (i, j), i < j, of openings on the same wall whose areas overlap."""
+        found = set()
+        for members in self.cells.values():
+            for a in range(len(members)):
+                first = self.openings[members[a]]
+                for b in range(a + 1, len(members)):
+                    second = self.openings[members[b]]
+                    if (first.x < second.x + second.width and second.x < first.x + first.width
+                            and first.y < second.y + second.height and second.y < first.y + first.height):
+                        found.add((members[a], members[b]))
+        return sorted(found)
+
+    def union_area_by_wall(self) -> Dict[str, float]:
+        """True (overlap-free) opening area on each wall."""
+        by_wall: Dict[str, List[Opening]] = defaultdict(list)
+        for o in self.openings:
+            by_wall[o.wall].append(o)
+        return {wall: union_area(items) for wall, items in by_wall.items()}
+
+
+def calculate_paint_requirement_positioned(calculator: PaintCalculator, room_name: str, perimeter: float, height: float, openings: List[Opening], paint_type: str) -> float:
+    """
+    Calculate paint for a room whose openings are positioned on its walls.
+
+    Overlapping openings are reported and their shared area is subtracted only once;
+    the rest of the calculation is PaintCalculator.calculate_paint_requirement.
+
+    Returns:
+        float: Paint required in liters.
+    """
+    index = OpeningIndex(openings)
+    for i, j in index.overlaps():
+        print(f"Warning: {room_name} {index.openings[i].kind} {i + 1} overlaps {index.openings[j].kind} {j + 1} on wall {index.openings[i].wall}.")
+    opening_area = sum(index.union_area_by_wall().values())
+    return calculator.calculate_paint_requirement(room_name, perimeter, height, [opening_area], [], paint_type)
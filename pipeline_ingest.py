@@ -0,0 +1,239 @@
+#  madakixo
+## Pipelined ingestion of compressed survey archives (.csv/.jsonl, optionally .gz
+## or .zst). Reading + decompression, parsing and estimation run as separate
+## threads joined by bounded queues, so I/O, decompression and computation overlap
+## and throughput approaches that of the slowest stage. zlib, zstandard and NumPy
+## release the GIL while they work, which is what lets the threads overlap.
+## .zst needs the zstandard package (or Python 3.14's compression.zstd).
+
+import argparse
+import csv
+import json
+import os
+import queue
+import threading
+import time
+import zlib
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from batch_estimate import parse_areas
+from frozen_calculator import FrozenPaintCalculator
+
+_DONE = object()
+
+
+class _Stopped(Exception):
+    """Raised inside a stage when the pipeline is shutting down."""
+
+
+class _Decompressor:
+    """Incremental gzip/zstd decompressor (pass-through for uncompressed files)."""
+
+    def __init__(self, path: str):
+        ext = os.path.splitext(path)[1].lower()
+        self.kind = ext if ext in ('.gz', '.zst') else ''
+        self._obj = self._new()
+
+    def _new(self):
+        if self.kind == '.gz':
+            return zlib.decompressobj(16 + zlib.MAX_WBITS)
+        if self.kind == '.zst':
+            try:
+                from compression import zstd
+                return zstd.ZstdDecompressor()
+            except ImportError:
+                import zstandard
+                return zstandard.ZstdDecompressor().decompressobj()
+        return None
+
+    def decompress(self, data: bytes) -> bytes:
+        if self._obj is None:
+            return data
+        out = self._obj.decompress(data)
+        # Concatenated gzip members or zstd frames (e.g. from appending archives) each need a fresh decompressor.
+        while self._obj.eof and self._obj.unused_data:
+            rest = self._obj.unused_data
+            self._obj = self._new()
+            out += self._obj.decompress(rest)
+        return out
+
+    @property
+    def eof(self) -> bool:
+        """True once the last member or frame has ended (always for uncompressed files)."""
+        return self._obj is None or self._obj.eof
+
+
+def input_format(path: str) -> str:
+    """'.csv' or '.jsonl', ignoring a trailing compression extension."""
+    base, ext = os.path.splitext(path.lower())
+    if ext in ('.gz', '.zst'):
+        ext = os.path.splitext(base)[1]
+    if ext not in ('.csv', '.jsonl'):
+        raise ValueError(f"Unsupported input format '{ext}'. Supported: .csv, .jsonl (optionally .gz or .zst)")
+    return ext
+
+
+class IngestPipeline:
+    """Three-stage read/decompress -> parse -> estimate pipeline over one archive."""
+
+    def __init__(self, calculator: Optional[FrozenPaintCalculator] = None, block_size: int = 1 << 20,
+                 batch_rooms: int = 20000, queue_size: int = 8):
+        """
+        Args:
+            calculator: Shared immutable calculator (a default FrozenPaintCalculator if omitted).
+            block_size: Bytes read from disk per block.
+            batch_rooms: Rooms per parsed batch handed to the estimate stage.
+            queue_size: Capacity of each queue between stages (bounds memory use).
+        """
+        self.calculator = calculator or FrozenPaintCalculator()
+        self.block_size = block_size
+        self.batch_rooms = batch_rooms
+        self.queue_size = queue_size
+        self.busy: Dict[str, float] = {}
+        self._stop = threading.Event()
+
+    def _put(self, out: queue.Queue, item) -> None:
+        """Blocking put that gives up once the pipeline is stopping, so no stage hangs on a full queue."""
+        while not self._stop.is_set():
+            try:
+                out.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+
+    def _get(self, source: queue.Queue):
+        """Blocking get that raises _Stopped once the pipeline is stopping, so no stage waits forever."""
+        while not self._stop.is_set():
+            try:
+                return source.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        raise _Stopped()
+
+    def _read(self, path: str, out: queue.Queue) -> None:
+        decompressor = _Decompressor(path)
+        with open(path, 'rb') as f:
+            while not self._stop.is_set():
+                block = f.read(self.block_size)
+                if not block:
+                    break
+                started = time.perf_counter()
+                data = decompressor.decompress(block)
+                self.busy['read'] += time.perf_counter() - started
+                if data:
+                    self._put(out, data)
+        if not self._stop.is_set() and not decompressor.eof:
+            raise ValueError(f"{path} is truncated or corrupt: the compressed stream ends early.")
+
+    def _parse(self, fmt: str, source: queue.Queue, out: queue.Queue) -> None:
+        codes = self.calculator.table.codes
+        pending = b''
+        header: Optional[List[str]] = None
+        while True:
+            data = self._get(source)
+            if isinstance(data, BaseException):
+                raise data
+            started = time.perf_counter()
+            if data is _DONE:
+                lines, pending = pending.splitlines(), b''
+            else:
+                pending += data
+                cut = pending.rfind(b'\n') + 1
+                lines, pending = pending[:cut].splitlines(), pending[cut:]
+            text = [line.decode('utf-8') for line in lines if line.strip()]
+            if fmt == '.csv':
+                rows = csv.reader(text)
+                if header is None and text:
+                    header = next(rows)
+                records = (dict(zip(header, row)) for row in rows)
+            else:
+                records = (json.loads(line) for line in text)
+            columns: Tuple[List[float], List[float], List[float], List[float], List[str]] = ([], [], [], [], [])
+            for record in records:
+                columns[0].append(float(record['perimeter']))
+                columns[1].append(float(record['height']))
+                columns[2].append(sum(parse_areas(record.get('window_areas'))))
+                columns[3].append(sum(parse_areas(record.get('door_areas'))))
+                columns[4].append(record.get('paint_type') or 'Emulsion paint')
+                if len(columns[0]) >= self.batch_rooms:
+                    self._put(out, tuple(np.array(c) for c in columns[:4]) + (codes(columns[4]),))
+                    columns = ([], [], [], [], [])
+            if columns[0]:
+                self._put(out, tuple(np.array(c) for c in columns[:4]) + (codes(columns[4]),))
+            self.busy['parse'] += time.perf_counter() - started
+            if data is _DONE:
+                return
+
+    def _estimate(self, source: queue.Queue) -> Tuple[np.ndarray, int]:
+        n_types = len(self.calculator.table.rates)
+        totals = np.zeros(n_types + 1)
+        rooms = 0
+        while True:
+            batch = self._get(source)
+            if isinstance(batch, BaseException):
+                raise batch
+            if batch is _DONE:
+                return totals, rooms
+            started = time.perf_counter()
+            litres = self.calculator.calculate_arrays(*batch)
+            # Unknown paint types (code -1) land in the last bucket, which is always 0 liters.
+            totals += np.bincount(np.where(batch[4] < 0, n_types, batch[4]), weights=litres, minlength=n_types + 1)
+            rooms += len(litres)
+            self.busy['estimate'] += time.perf_counter() - started
+
+    def run(self, path: str) -> Tuple[Dict[str, float], int]:
+        """
+        Estimate every room in an (optionally compressed) CSV/JSONL archive.
+
+        Returns:
+            Tuple of (litres per paint type, number of rooms).
+        """
+        fmt = input_format(path)
+        self.busy = {'read': 0.0, 'parse': 0.0, 'estimate': 0.0}
+        raw: queue.Queue = queue.Queue(self.queue_size)
+        parsed: queue.Queue = queue.Queue(self.queue_size)
+
+        def stage(target: Callable, downstream: queue.Queue, *args) -> threading.Thread:
+            def body() -> None:
+                try:
+                    target(*args)
+                    self._put(downstream, _DONE)
+                except _Stopped:
+                    pass
+                except BaseException as e:
+                    self._put(downstream, e)
+            thread = threading.Thread(target=body, daemon=True)
+            thread.start()
+            return thread
+
+        self._stop.clear()
+        threads = [stage(self._read, raw, path, raw), stage(self._parse, parsed, fmt, raw, parsed)]
+        try:
+            totals, rooms = self._estimate(parsed)
+        finally:
+            self._stop.set()
+            for thread in threads:
+                thread.join()
+        names = list(self.calculator.table.rates)
+        return {name: float(totals[i]) for i, name in enumerate(names) if totals[i]}, rooms
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Estimate paint for compressed survey archives.")
+    parser.add_argument('inputs', nargs='+', help="Archives: .csv/.jsonl, optionally .gz or .zst")
+    args = parser.parse_args()
+    pipeline = IngestPipeline()
+    for path in args.inputs:
+        started = time.perf_counter()
+        totals, rooms = pipeline.run(path)
+        elapsed = time.perf_counter() - started
+        stages = ', '.join(f"{name} {seconds:.2f}s" for name, seconds in pipeline.busy.items())
+        print(f"{path}: {rooms:,} rooms in {elapsed:.2f}s ({rooms / elapsed:,.0f} rooms/s; busy: {stages})")
+        for paint_type, litres in sorted(totals.items()):
+            print(f"  {paint_type}: {litres:.2f} liters")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+#  madakixo
+## Quick ballpark estimates from a stratified random sample of rooms. Each sampled
+## room goes through the normal calculate_paint_requirement; totals per paint type
+## are extrapolated per stratum (room type by default) and returned with confidence
+## intervals. More rooms can be sampled later to narrow the interval, up to the
+## exact answer once every room has been sampled.
+
+import random
+from collections import defaultdict
+from math import sqrt
+from statistics import NormalDist
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from batch_estimate import Room
+from paint_1 import PaintCalculator
+
+Interval = Tuple[float, float, float]
+
+
+class _Stratum:
+    """Rooms of one stratum, what has been sampled from it, and running sums per paint type."""
+
+    def __init__(self):
+        self.members: List[int] = []
+        self.taken: Set[int] = set()
+        self.sums: Dict[str, float] = defaultdict(float)
+        self.squares: Dict[str, float] = defaultdict(float)
+
+    def draw(self, rng: random.Random, count: int) -> List[int]:
+        """Up to `count` more members, sampled without replacement."""
+        remaining = len(self.members) - len(self.taken)
+        count = min(count, remaining)
+        if count <= 0:
+            return []
+        if count > remaining // 2:
+            # Close to exhausting the stratum: shuffle what is left rather than reject repeats.
+            picked = rng.sample([m for m in self.members if m not in self.taken], count)
+            self.taken.update(picked)
+            return picked
+        picked = []
+        while len(picked) < count:
+            member = self.members[rng.randrange(len(self.members))]
+            if member not in self.taken:
+                self.taken.add(member)
+                picked.append(member)
+        return picked
+
+
+class QuickEstimate:
+    """Progressive stratified-sample estimate of total litres per paint type."""
+
+    def __init__(self, rooms: Sequence[Room], stratify_by: str = 'room_type',
+                 calculator: Optional[PaintCalculator] = None, confidence: float = 0.95, seed: Optional[int] = None):
+        """
+        Args:
+            rooms: The full inventory (any sequence supporting indexing).
+            stratify_by: Room field to stratify on, e.g. 'room_type' or 'paint_type'.
+            calculator: Calculator used for sampled rooms (a new PaintCalculator by default).
+            confidence: Confidence level of the returned intervals.
+            seed: Random seed for a reproducible sample.
+        """
+        self.rooms = rooms
+        self.calculator = calculator or PaintCalculator()
+        self.z = NormalDist().inv_cdf(0.5 + confidence / 2)
+        self.rng = random.Random(seed)
+        self.strata: Dict[str, _Stratum] = defaultdict(_Stratum)
+        for i, room in enumerate(rooms):
+            self.strata[str(room.get(stratify_by, ''))].members.append(i)
+        self.paint_types: Set[str] = set()
+
+    @property
+    def sample_size(self) -> int:
+        """Number of rooms sampled so far."""
+        return sum(len(s.taken) for s in self.strata.values())
+
+    def refine(self, sample_size: int) -> Dict[str, Interval]:
+        """
+        Sample more rooms until about `sample_size` have been sampled in total (proportional
+        allocation, at least two per stratum), then return the updated estimate.
+        """
+        population = len(self.rooms)
+        for stratum in self.strata.values():
+            target = max(2, round(sample_size * len(stratum.members) / population)) if population else 0
+            for i in stratum.draw(self.rng, target - len(stratum.taken)):
+                room = self.rooms[i]
+                litres = self.calculator.calculate_paint_requirement(
+                    room['room_name'], room['perimeter'], room['height'],
+                    room['window_areas'], room['door_areas'], room['paint_type'])
+                stratum.sums[room['paint_type']] += litres
+                stratum.squares[room['paint_type']] += litres * litres
+                self.paint_types.add(room['paint_type'])
+        return self.estimate()
+
+    def estimate(self) -> Dict[str, Interval]:
+        """
+        Current estimate per paint type as (total liters, lower bound, upper bound).
+
+        Uses the stratified estimator sum(N_h * mean_h) with a finite population correction,
+        so the interval shrinks to zero once every room has been sampled.
+        """
+        result: Dict[str, Interval] = {}
+        for paint_type in sorted(self.paint_types):
+            total = variance = 0.0
+            for stratum in self.strata.values():
+                n, size = len(stratum.taken), len(stratum.members)
+                if n == 0:
+                    continue
+                s, sq = stratum.sums.get(paint_type, 0.0), stratum.squares.get(paint_type, 0.0)
+                total += size * s / n
+                if n > 1:
+                    variance += size * size * (1 - n / size) * max(0.0, (sq - s * s / n) / (n - 1)) / n
+            margin = self.z * sqrt(variance)
+            result[paint_type] = (total, max(0.0, total - margin), total + margin)
+        return result
+
+
+def quick_estimate(rooms: Sequence[Room], sample_size: int = 2000, stratify_by: str = 'room_type',
+                   confidence: float = 0.95, seed: Optional[int] = None) -> Tuple[Dict[str, Interval], int]:
+    """
+    One-shot ballpark: litres per paint type with confidence intervals, and the sample size used.
+    """
+    estimator = QuickEstimate(rooms, stratify_by, confidence=confidence, seed=seed)
+    return estimator.refine(sample_size), estimator.sample_size
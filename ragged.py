@@ -0,0 +1,128 @@
+#  madakixo
+## Ragged opening lists as CSR arrays. Instead of a window_areas and a door_areas
+## list per room, every opening of every room sits in one flat `areas` array with
+## a parallel `kinds` array (WINDOW or DOOR); room i owns openings
+## offsets[i]:offsets[i + 1]. Per-room window and door totals come out of one
+## np.add.reduceat over the flat array, so a room with 500 openings costs the
+## same per opening as a room with one, and there is no Python loop per room.
+
+import argparse
+import itertools
+import time
+from typing import Dict, Iterable, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from frozen_calculator import FrozenPaintCalculator
+
+Room = Dict[str, object]
+
+WINDOW: int = 0
+DOOR: int = 1
+
+
+class Openings(NamedTuple):
+    """Openings of many rooms in CSR form."""
+    offsets: np.ndarray  # int64, len(rooms) + 1, starting at 0
+    areas: np.ndarray    # float64 area of each opening in m²
+    kinds: np.ndarray    # int8 WINDOW or DOOR
+
+    @property
+    def room_count(self) -> int:
+        return len(self.offsets) - 1
+
+    def counts(self) -> np.ndarray:
+        """Number of openings in each room."""
+        return np.diff(self.offsets)
+
+    def room(self, i: int) -> Tuple[list, list]:
+        """(window_areas, door_areas) of room i as Python lists."""
+        areas = self.areas[self.offsets[i]:self.offsets[i + 1]]
+        kinds = self.kinds[self.offsets[i]:self.offsets[i + 1]]
+        return areas[kinds == WINDOW].tolist(), areas[kinds == DOOR].tolist()
+
+
+def from_rooms(rooms: Iterable[Room]) -> Openings:
+    """Flatten the window_areas/door_areas lists of room dicts into CSR arrays."""
+    rooms = list(rooms)
+    windows = [room['window_areas'] for room in rooms]
+    doors = [room['door_areas'] for room in rooms]
+    n_windows = np.fromiter(map(len, windows), dtype=np.int64, count=len(rooms))
+    n_doors = np.fromiter(map(len, doors), dtype=np.int64, count=len(rooms))
+    counts = n_windows + n_doors
+    offsets = np.zeros(len(rooms) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    # Each room's windows then its doors, in list order.
+    areas = np.fromiter(itertools.chain.from_iterable(itertools.chain(w, d) for w, d in zip(windows, doors)),
+                        dtype=np.float64, count=int(offsets[-1]))
+    starts = offsets[:-1]
+    kinds = np.full(len(areas), DOOR, dtype=np.int8)
+    window_slots = np.repeat(starts - np.cumsum(n_windows) + n_windows, n_windows) + np.arange(n_windows.sum())
+    kinds[window_slots] = WINDOW
+    return Openings(offsets, areas, kinds)
+
+
+def segment_sums(offsets: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """
+    Sum of values[offsets[i]:offsets[i + 1]] for every segment, in one np.add.reduceat.
+
+    reduceat returns values[offsets[i]] for an empty segment (and rejects an index equal
+    to len(values)), so a zero is appended and empty segments are zeroed afterwards.
+    """
+    if len(offsets) < 2:
+        return np.zeros(0, dtype=values.dtype)
+    sums = np.add.reduceat(np.append(values, values.dtype.type(0)), offsets[:-1])
+    sums[offsets[1:] == offsets[:-1]] = 0
+    return sums
+
+
+def opening_totals(openings: Openings) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Window and door totals per room.
+
+    NumPy sums long segments pairwise rather than strictly left to right, so for rooms with
+    more than a few openings the totals can differ from sum() in the last bit or so.
+    """
+    doors = openings.kinds == DOOR
+    window_total = segment_sums(openings.offsets, np.where(doors, 0.0, openings.areas))
+    door_total = segment_sums(openings.offsets, np.where(doors, openings.areas, 0.0))
+    return window_total, door_total
+
+
+def opening_totals_cm2(openings: Openings) -> np.ndarray:
+    """Total opening area per room in cm², each opening rounded to whole cm² first (as fixed_point.to_cm2)."""
+    return segment_sums(openings.offsets, np.round(openings.areas * 10000).astype(np.int64))
+
+
+def calculate_ragged(perimeter: np.ndarray, height: np.ndarray, openings: Openings, codes: np.ndarray,
+                     calculator: Optional[FrozenPaintCalculator] = None) -> np.ndarray:
+    """Litres per room for columns of rooms whose openings are given in CSR form."""
+    window_total, door_total = opening_totals(openings)
+    return (calculator or FrozenPaintCalculator()).calculate_arrays(perimeter, height, window_total, door_total, codes)
+
+
+def benchmark(openings_total: int = 5_000_000, repeat: int = 3) -> None:
+    """Time opening_totals for rooms with 1, 10, 100 and 500 openings each (same opening count overall)."""
+    rng = np.random.default_rng(0)
+    for per_room in (1, 10, 100, 500):
+        rooms = openings_total // per_room
+        openings = Openings(np.arange(rooms + 1, dtype=np.int64) * per_room, rng.uniform(0.5, 4, rooms * per_room),
+                            (rng.random(rooms * per_room) < 0.3).astype(np.int8))
+        best = float('inf')
+        for _ in range(repeat):
+            started = time.perf_counter()
+            opening_totals(openings)
+            best = min(best, time.perf_counter() - started)
+        print(f"{per_room:>3} openings/room: {rooms:>9,} rooms, {best * 1000:.1f} ms, "
+              f"{best / (rooms * per_room) * 1e9:.2f} ns per opening")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the segmented opening reduction.")
+    parser.add_argument('--openings', type=int, default=5_000_000)
+    args = parser.parse_args()
+    benchmark(args.openings)
+
+
+if __name__ == "__main__":
+    main()
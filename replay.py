@@ -0,0 +1,164 @@
+#  madakixo
+## Record-and-replay harness for the interactive scripts (paint_1.py, patch_2.py,
+## script_1.py ... script_7.py). Recording runs a script normally and saves every
+## answer typed into a JSON transcript. Replaying feeds the answers back in place
+## of input(), captures everything the script prints and compares it with a golden
+## file, so the interactive path can be regression-tested without anyone typing.
+##
+##   python replay.py record paint_1.py transcripts/parlour_defaults.json
+##   python replay.py replay transcripts/            (compare with goldens)
+##   python replay.py replay transcripts/ --update   (write or rewrite goldens)
+
+import argparse
+import builtins
+import contextlib
+import difflib
+import io
+import json
+import os
+import sys
+from typing import Dict, Iterator, List, Optional, Tuple
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+GOLDEN_SUFFIX: str = '.golden.txt'
+
+_compiled: Dict[str, object] = {}
+
+
+def _script_code(script: str):
+    """Compile a script once; replays exec the cached code object."""
+    path = script if os.path.isabs(script) else os.path.join(HERE, script)
+    if path not in _compiled:
+        with open(path, encoding='utf-8') as f:
+            _compiled[path] = compile(f.read(), path, 'exec')
+    return _compiled[path]
+
+
+@contextlib.contextmanager
+def _patched_input(replacement) -> Iterator[None]:
+    original = builtins.input
+    builtins.input = replacement
+    try:
+        yield
+    finally:
+        builtins.input = original
+
+
+def _run_script(script: str) -> Optional[BaseException]:
+    """Run a script as __main__; returns the exception that ended it, if any."""
+    try:
+        exec(_script_code(script), {'__name__': '__main__', '__file__': script})
+    except (EOFError, KeyboardInterrupt, Exception) as e:
+        return e
+    return None
+
+
+def record(script: str, transcript_path: str) -> None:
+    """Run `script` interactively and save the answers typed to `transcript_path`."""
+    answers: List[str] = []
+    real_input = builtins.input
+
+    def recording_input(prompt: str = '') -> str:
+        answer = real_input(prompt)
+        answers.append(answer)
+        return answer
+
+    with _patched_input(recording_input):
+        _run_script(script)
+    with open(transcript_path, 'w', encoding='utf-8') as f:
+        json.dump({'script': script, 'answers': answers}, f, indent=1)
+    print(f"Recorded {len(answers)} answers to {transcript_path}")
+
+
+def replay(script: str, answers: List[str]) -> str:
+    """
+    Run `script` with `answers` fed to input() and return everything it printed.
+
+    Prompts and answers are included as a terminal would show them. If the script asks for
+    more answers than recorded, the run stops with EOF as it would on a closed stdin.
+    """
+    remaining = iter(answers)
+    output = io.StringIO()
+
+    def replay_input(prompt: str = '') -> str:
+        output.write(str(prompt))
+        answer = next(remaining, None)
+        if answer is None:
+            raise EOFError("transcript has no more answers")
+        output.write(answer + '\n')
+        return answer
+
+    with _patched_input(replay_input), contextlib.redirect_stdout(output):
+        error = _run_script(script)
+    if error is not None:
+        output.write(f"[stopped: {type(error).__name__}: {error}]\n")
+    return output.getvalue()
+
+
+def find_transcripts(paths: List[str]) -> List[str]:
+    """Transcript files among `paths`, descending into directories."""
+    found: List[str] = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                found.extend(os.path.join(root, name) for name in sorted(files) if name.endswith('.json'))
+        else:
+            found.append(path)
+    return found
+
+
+def check_transcript(transcript_path: str, update: bool = False) -> Tuple[bool, str]:
+    """
+    Replay one transcript against its golden file (<transcript>.golden.txt).
+
+    Goldens are only written with `update`; a missing golden fails the check, so a new
+    transcript cannot pass without its output having been recorded deliberately.
+
+    Returns:
+        Tuple of (passed, unified diff or status message).
+    """
+    with open(transcript_path, encoding='utf-8') as f:
+        transcript = json.load(f)
+    output = replay(transcript['script'], transcript['answers'])
+    golden_path = os.path.splitext(transcript_path)[0] + GOLDEN_SUFFIX
+    if update:
+        with open(golden_path, 'w', encoding='utf-8') as f:
+            f.write(output)
+        return True, f"wrote {golden_path}"
+    if not os.path.exists(golden_path):
+        return False, f"missing golden {golden_path} (run with --update to create it)"
+    with open(golden_path, encoding='utf-8') as f:
+        expected = f.read()
+    if output == expected:
+        return True, ''
+    diff = difflib.unified_diff(expected.splitlines(True), output.splitlines(True), golden_path, 'replay')
+    return False, ''.join(diff)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Record and replay interactive calculator sessions.")
+    commands = parser.add_subparsers(dest='command', required=True)
+    rec = commands.add_parser('record', help="Run a script interactively and save the answers")
+    rec.add_argument('script', help="e.g. paint_1.py")
+    rec.add_argument('transcript', help="Transcript file to write (.json)")
+    rep = commands.add_parser('replay', help="Replay transcripts and compare with golden output")
+    rep.add_argument('paths', nargs='+', help="Transcript files or directories")
+    rep.add_argument('--update', action='store_true', help="Rewrite golden files instead of comparing")
+    args = parser.parse_args()
+
+    if args.command == 'record':
+        record(args.script, args.transcript)
+        return
+    failures = 0
+    transcripts = find_transcripts(args.paths)
+    for path in transcripts:
+        passed, message = check_transcript(path, args.update)
+        if not passed:
+            failures += 1
+            print(f"FAIL {path}\n{message}")
+    print(f"{len(transcripts) - failures}/{len(transcripts)} transcripts match")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+#  madakixo
+## Room schedule reports (HTML and CSV). Rows are streamed to the file as they are
+## calculated, with subtotals per group (e.g. building) and grand totals per
+## paint type, so memory use does not grow with the size of the project. The HTML
+## has print styles, so "Print to PDF" in a browser gives a paginated schedule.
+
+import argparse
+import csv
+import html
+import os
+from string import Template
+from typing import Dict, Iterable, Iterator, Optional, TextIO, Tuple
+
+from batch_estimate import Room, read_rooms
+from paint_1 import PaintCalculator
+
+Row = Tuple[str, str, float, str, float]
+
+HTML_HEAD = Template("""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>$title</title>
+<style>
+body { font-family: sans-serif; font-size: 10pt; }
+table { border-collapse: collapse; width: 100%; }
+th, td { border-bottom: 1px solid #ccc; padding: 2px 6px; text-align: left; }
+td.num, th.num { text-align: right; }
+tr.subtotal td { font-weight: bold; background: #f2f2f2; }
+tr.total td { font-weight: bold; border-top: 2px solid #000; }
+thead { display: table-header-group; }
+tr { page-break-inside: avoid; }
+@page { size: A4; margin: 15mm; }
+</style></head><body>
+<h1>$title</h1>
+<table>
+<thead><tr><th>$group_label</th><th>Room</th><th class="num">Net area (m²)</th><th>Paint type</th><th class="num">Paint (liters)</th></tr></thead>
+<tbody>
+""")
+HTML_ROW = Template('<tr><td>$group</td><td>$room</td><td class="num">$area</td><td>$paint_type</td><td class="num">$litres</td></tr>\n')
+HTML_SUBTOTAL = Template('<tr class="$css"><td>$group</td><td>$label</td><td class="num">$area</td><td>$paint_type</td><td class="num">$litres</td></tr>\n')
+HTML_FOOT = "</tbody>\n</table>\n</body></html>\n"
+
+
+def schedule_rows(rooms: Iterable[Room], group_field: str = 'building',
+                  calculator: Optional[PaintCalculator] = None) -> Iterator[Row]:
+    """Yield (group, room name, net area, paint type, liters) for each room, in input order."""
+    calculator = calculator or PaintCalculator()
+    for room in rooms:
+        net_wall_area = room['perimeter'] * room['height'] - sum(room['window_areas']) - sum(room['door_areas'])
+        litres = calculator.calculate_paint_requirement(
+            room['room_name'], room['perimeter'], room['height'],
+            room['window_areas'], room['door_areas'], room['paint_type'])
+        yield str(room.get(group_field, '')), room['room_name'], net_wall_area, room['paint_type'], litres
+
+
+def with_subtotals(rows: Iterable[Row]) -> Iterator[Tuple[str, Row]]:
+    """
+    Interleave subtotal rows into a stream of schedule rows.
+
+    Yields ('room', row) for every room, ('subtotal', row) per paint type whenever the group
+    changes (rows are expected to arrive grouped, e.g. sorted by building), and finally
+    ('total', row) per paint type for the whole project. Only the running totals are kept.
+    """
+    group_totals: Dict[str, Tuple[float, float]] = {}
+    grand_totals: Dict[str, Tuple[float, float]] = {}
+    current: Optional[str] = None
+
+    def flush(totals: Dict[str, Tuple[float, float]], kind: str, group: str) -> Iterator[Tuple[str, Row]]:
+        for paint_type, (area, litres) in sorted(totals.items()):
+            yield kind, (group, 'Subtotal' if kind == 'subtotal' else 'Total', area, paint_type, litres)
+
+    for row in rows:
+        group, _, area, paint_type, litres = row
+        if group != current and current is not None:
+            yield from flush(group_totals, 'subtotal', current)
+            group_totals = {}
+        current = group
+        yield 'room', row
+        for totals in (group_totals, grand_totals):
+            a, l = totals.get(paint_type, (0.0, 0.0))
+            totals[paint_type] = (a + max(area, 0.0), l + litres)
+    if current is not None:
+        yield from flush(group_totals, 'subtotal', current)
+    yield from flush(grand_totals, 'total', '')
+
+
+def _write_buffered(out: TextIO, lines: Iterable[str], buffer_rows: int = 1000) -> None:
+    """Write lines in batches, which is much faster than one write() per row."""
+    batch = []
+    for line in lines:
+        batch.append(line)
+        if len(batch) >= buffer_rows:
+            out.writelines(batch)
+            batch = []
+    out.writelines(batch)
+
+
+def write_html_schedule(path: str, rooms: Iterable[Room], title: str = 'Paint schedule',
+                        group_field: str = 'building', calculator: Optional[PaintCalculator] = None) -> None:
+    """Stream an HTML room schedule with subtotals per `group_field` to `path`."""
+    def lines() -> Iterator[str]:
+        for kind, (group, room, area, paint_type, litres) in with_subtotals(schedule_rows(rooms, group_field, calculator)):
+            values = dict(group=html.escape(group), area=f"{area:.2f}", paint_type=html.escape(paint_type), litres=f"{litres:.2f}")
+            if kind == 'room':
+                yield HTML_ROW.substitute(values, room=html.escape(room))
+            else:
+                yield HTML_SUBTOTAL.substitute(values, css=kind, label=room)
+
+    with open(path, 'w', encoding='utf-8') as out:
+        out.write(HTML_HEAD.substitute(title=html.escape(title), group_label=html.escape(group_field.capitalize())))
+        _write_buffered(out, lines())
+        out.write(HTML_FOOT)
+
+
+def write_csv_schedule(path: str, rooms: Iterable[Room], group_field: str = 'building',
+                       calculator: Optional[PaintCalculator] = None) -> None:
+    """Stream the same schedule as CSV, with a `row_type` column marking subtotal and total rows."""
+    with open(path, 'w', newline='', encoding='utf-8') as out:
+        writer = csv.writer(out)
+        writer.writerow(['row_type', group_field, 'room_name', 'net_area_m2', 'paint_type', 'litres'])
+        writer.writerows((kind, group, room, f"{area:.2f}", paint_type, f"{litres:.2f}")
+                         for kind, (group, room, area, paint_type, litres)
+                         in with_subtotals(schedule_rows(rooms, group_field, calculator)))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Write a room-by-room paint schedule (HTML or CSV).")
+    parser.add_argument('input', help="Room inventory (.csv or .jsonl), grouped by --group")
+    parser.add_argument('output', help="Schedule file (.html or .csv)")
+    parser.add_argument('--group', default='building', help="Field to subtotal by (default building)")
+    parser.add_argument('--title', default='Paint schedule')
+    args = parser.parse_args()
+    if os.path.splitext(args.output)[1].lower() == '.csv':
+        write_csv_schedule(args.output, read_rooms(args.input), args.group)
+    else:
+        write_html_schedule(args.output, read_rooms(args.input), args.title, args.group)
+
+
+if __name__ == "__main__":
+    main()
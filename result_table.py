@@ -0,0 +1,110 @@
+#  madakixo
+## In-memory columnar table of batch results for ad-hoc questions such as
+## "litres of Gloss paint on storey 3 of block B". Numeric columns are NumPy
+## arrays; categorical columns are dictionary-encoded with a packed bitmap per
+## value, so a filter is a few bitwise ANDs instead of a scan over Python lists.
+
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from batch_estimate import Room
+from paint_1 import PaintCalculator
+
+CATEGORICAL_FIELDS: List[str] = ['paint_type', 'building', 'storey', 'room_type']
+Value = Union[str, int, float]
+
+
+class ResultTable:
+    """Columnar per-room results (area, litres) with bitmap indexes on categorical fields."""
+
+    def __init__(self, columns: Dict[str, Sequence], categorical: Sequence[str] = CATEGORICAL_FIELDS):
+        """
+        Args:
+            columns: Equal-length columns; numeric ones (e.g. 'area', 'litres') become float arrays.
+            categorical: Column names to dictionary-encode and index with bitmaps.
+        """
+        lengths = {len(values) for values in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError("All columns must have the same length.")
+        self.rows = lengths.pop() if lengths else 0
+        self.numeric: Dict[str, np.ndarray] = {}
+        self.codes: Dict[str, np.ndarray] = {}
+        self.dictionary: Dict[str, Dict[str, int]] = {}
+        self._bitmaps: Dict[Tuple[str, int], np.ndarray] = {}
+        for name, values in columns.items():
+            if name in categorical:
+                labels, codes = np.unique(np.asarray([str(v) for v in values], dtype=object), return_inverse=True)
+                self.codes[name] = codes.astype(np.int32)
+                self.dictionary[name] = {label: i for i, label in enumerate(labels)}
+            elif name != 'room_name':
+                self.numeric[name] = np.asarray(values, dtype=np.float64)
+
+    @classmethod
+    def from_rooms(cls, rooms: Iterable[Room], calculator: Optional[PaintCalculator] = None) -> 'ResultTable':
+        """Estimate each room and keep its net area, litres and categorical fields as columns."""
+        calculator = calculator or PaintCalculator()
+        columns: Dict[str, List] = {'area': [], 'litres': [], **{name: [] for name in CATEGORICAL_FIELDS}}
+        for room in rooms:
+            columns['area'].append(room['perimeter'] * room['height'] - sum(room['window_areas']) - sum(room['door_areas']))
+            columns['litres'].append(calculator.calculate_paint_requirement(
+                room['room_name'], room['perimeter'], room['height'],
+                room['window_areas'], room['door_areas'], room['paint_type']))
+            for name in CATEGORICAL_FIELDS:
+                columns[name].append(room.get(name, ''))
+        return cls(columns)
+
+    def bitmap(self, field: str, value: Value) -> np.ndarray:
+        """Packed bitmap (little-endian bits) of the rows where `field` equals `value`; built once per value."""
+        code = self.dictionary[field].get(str(value))
+        if code is None:
+            return np.zeros((self.rows + 7) // 8, dtype=np.uint8)
+        key = (field, code)
+        if key not in self._bitmaps:
+            self._bitmaps[key] = np.packbits(self.codes[field] == code, bitorder='little')
+        return self._bitmaps[key]
+
+    def select(self, ranges: Optional[Dict[str, Tuple[Optional[float], Optional[float]]]] = None,
+               **filters: Union[Value, Sequence[Value]]) -> np.ndarray:
+        """
+        Boolean row mask for the given filters.
+
+        Args:
+            ranges: Numeric bounds per column, e.g. {'area': (50, None)} for area > 50 (low exclusive,
+                high inclusive; None means unbounded).
+            **filters: Categorical equality, e.g. paint_type='Gloss paint', storey=3; a list or tuple
+                means any of those values.
+        """
+        combined: Optional[np.ndarray] = None
+        for field, wanted in filters.items():
+            values = wanted if isinstance(wanted, (list, tuple, set)) else [wanted]
+            bitmap = np.zeros((self.rows + 7) // 8, dtype=np.uint8)
+            for value in values:
+                bitmap |= self.bitmap(field, value)
+            combined = bitmap if combined is None else combined & bitmap
+        mask = (np.ones(self.rows, dtype=bool) if combined is None
+                else np.unpackbits(combined, count=self.rows, bitorder='little').view(bool))
+        for column, (low, high) in (ranges or {}).items():
+            values = self.numeric[column]
+            if low is not None:
+                mask &= values > low
+            if high is not None:
+                mask &= values <= high
+        return mask
+
+    def count(self, ranges: Optional[Dict[str, Tuple[Optional[float], Optional[float]]]] = None,
+              **filters: Union[Value, Sequence[Value]]) -> int:
+        """Number of rows matching the filters (see select)."""
+        return int(np.count_nonzero(self.select(ranges, **filters)))
+
+    def sum(self, column: str = 'litres', ranges: Optional[Dict[str, Tuple[Optional[float], Optional[float]]]] = None,
+            **filters: Union[Value, Sequence[Value]]) -> float:
+        """Sum of a numeric column over the rows matching the filters (see select)."""
+        return float(np.sum(self.numeric[column], where=self.select(ranges, **filters)))
+
+    def group_sum(self, field: str, column: str = 'litres', **filters: Union[Value, Sequence[Value]]) -> Dict[str, float]:
+        """Sum of `column` per value of a categorical field, over rows matching the filters."""
+        mask = self.select(**filters)
+        sums = np.bincount(self.codes[field][mask], weights=self.numeric[column][mask],
+                           minlength=len(self.dictionary[field]))
+        return {label: float(sums[code]) for label, code in self.dictionary[field].items() if sums[code]}
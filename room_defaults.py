@@ -0,0 +1,16 @@
+#  madakixo
+## Room defaults offered by the interactive calculator (paint_1.py run_calculator),
+## shared by the survey server and the synthetic inventory generator.
+
+from typing import Dict, Tuple
+
+# Defaults offered by run_calculator for each room type:
+# (perimeter m, windows, window length m, window height m, doors, door length m)
+ROOM_TYPES: Dict[str, Tuple[float, int, float, float, int, float]] = {
+    'Parlour': (15.3, 2, 1.0, 1.2, 2, 0.9),
+    'Bedroom': (12.9, 1, 1.0, 1.2, 2, 0.9),
+    'Toilet': (6.0, 1, 0.6, 0.6, 1, 0.75),
+    'Kitchen': (6.6, 1, 0.6, 0.6, 1, 0.75),
+}
+DEFAULT_HEIGHT: float = 3.0
+DOOR_HEIGHT: float = 2.1
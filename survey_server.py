@@ -0,0 +1,163 @@
+#  madakixo
+## Multi-session survey server: the run_calculator prompt flow from paint_1.py
+## served over TCP with asyncio, one line per answer. Every connection is an
+## independent session (its state is just the coroutine's locals); all sessions
+## share one PaintCalculator. Try it with: nc localhost 8765
+
+import argparse
+import asyncio
+import contextlib
+import io
+from typing import List, Optional, Tuple
+
+from paint_1 import PaintCalculator
+from room_defaults import DEFAULT_HEIGHT, DOOR_HEIGHT, ROOM_TYPES
+
+ROOMS: List[str] = ['Parlour', 'Bedroom', 'Toilet', 'Kitchen']
+
+
+class SessionClosed(Exception):
+    """The surveyor disconnected."""
+
+
+class SurveySession:
+    """One surveyor's pass through the rooms, reading answers from a stream."""
+
+    def __init__(self, calculator: PaintCalculator, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.calculator = calculator
+        self.reader = reader
+        self.writer = writer
+
+    async def say(self, text: str) -> None:
+        self.writer.write((text + '\n').encode())
+        await self.writer.drain()
+
+    async def ask(self, prompt: str) -> str:
+        """Send a prompt and wait for the answer line."""
+        self.writer.write(prompt.encode())
+        await self.writer.drain()
+        line = await self.reader.readline()
+        if not line:
+            raise SessionClosed()
+        return line.decode(errors='replace').strip()
+
+    async def get_float_input(self, prompt: str, default: Optional[float] = None) -> float:
+        """Async PaintCalculator.get_float_input."""
+        while True:
+            user_input = await self.ask(prompt)
+            if not user_input and default is not None:
+                return default
+            try:
+                return float(user_input)
+            except ValueError:
+                await self.say("Please enter a valid number.")
+
+    async def get_int_input(self, prompt: str, default: Optional[int] = None) -> int:
+        """Async PaintCalculator.get_int_input."""
+        while True:
+            try:
+                user_input = await self.ask(prompt)
+                if not user_input and default is not None:
+                    return default
+                result = int(user_input)
+                if result < 0:
+                    raise ValueError("Number of windows or doors cannot be negative.")
+                return result
+            except ValueError as ve:
+                await self.say(f"Error: {ve}")
+
+    def calculate(self, room: str, perimeter: float, height: float, window_areas: List[float], door_areas: List[float], paint_type: str) -> Tuple[float, str]:
+        """Run the shared calculator, capturing its error output for this session only."""
+        # calculate_paint_requirement never awaits, so no other session can print in between.
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            litres = self.calculator.calculate_paint_requirement(room, perimeter, height, window_areas, door_areas, paint_type)
+        return litres, output.getvalue().rstrip()
+
+    async def run(self) -> None:
+        """The run_calculator flow for the standard rooms."""
+        for room in ROOMS:
+            default_perimeter, default_windows, w_length, w_height, default_doors, d_length = ROOM_TYPES[room]
+            await self.say(f"\n--- {room} Details ---")
+            try:
+                perimeter = await self.get_float_input(f"Enter the perimeter of the {room} in meters (default {default_perimeter:g}m): ", default_perimeter)
+                if perimeter <= 0:
+                    raise ValueError("Perimeter must be positive.")
+                height = await self.get_float_input(f"Enter the height of the {room} in meters (default {DEFAULT_HEIGHT:g}m): ", DEFAULT_HEIGHT)
+                if height <= 0:
+                    raise ValueError("Height must be positive.")
+
+                num_windows = await self.get_int_input(f"Enter the number of windows in the {room} (default {default_windows}): ", default_windows)
+                window_areas: List[float] = []
+                for i in range(num_windows):
+                    length = await self.get_float_input(f"Enter the length of window {i+1} in meters (default {w_length:g}m): ", w_length)
+                    if length <= 0:
+                        raise ValueError("Window length must be positive.")
+                    w_h = await self.get_float_input(f"Enter the height of window {i+1} in meters (default {w_height:g}m): ", w_height)
+                    if w_h <= 0:
+                        raise ValueError("Window height must be positive.")
+                    window_areas.append(length * w_h)
+
+                num_doors = await self.get_int_input(f"Enter the number of doors in the {room} (default {default_doors}): ", default_doors)
+                door_areas: List[float] = []
+                for i in range(num_doors):
+                    length = await self.get_float_input(f"Enter the length of door {i+1} in meters (default {d_length:g}m): ", d_length)
+                    if length <= 0:
+                        raise ValueError("Door length must be positive.")
+                    d_h = await self.get_float_input(f"Enter the height of door {i+1} in meters (default {DOOR_HEIGHT:g}m): ", DOOR_HEIGHT)
+                    if d_h <= 0:
+                        raise ValueError("Door height must be positive.")
+                    door_areas.append(length * d_h)
+
+                await self.say("\nAvailable paint types:\n" + "\n".join(f"- {p}" for p in self.calculator.coverage_rates))
+                paint_type = await self.ask(f"Enter the type of paint for the {room} (default 'Emulsion paint'): ") or 'Emulsion paint'
+
+                litres, errors = self.calculate(room, perimeter, height, window_areas, door_areas, paint_type)
+                if errors:
+                    await self.say(errors)
+                await self.say(f"Total paint required for {room}: {litres:.2f} liters")
+            except ValueError as ve:
+                await self.say(f"Error in {room} details: {ve}")
+
+
+class SurveyServer:
+    """asyncio TCP server running a SurveySession per connection."""
+
+    def __init__(self, calculator: Optional[PaintCalculator] = None, host: str = '127.0.0.1', port: int = 8765):
+        self.calculator = calculator or PaintCalculator()
+        self.host = host
+        self.port = port
+        self.sessions = 0
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.sessions += 1
+        try:
+            await SurveySession(self.calculator, reader, writer).run()
+        except (SessionClosed, ConnectionError):
+            pass
+        finally:
+            self.sessions -= 1
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+    async def serve_forever(self) -> None:
+        server = await asyncio.start_server(self.handle, self.host, self.port)
+        print(f"Survey server listening on {self.host}:{self.port}")
+        async with server:
+            await server.serve_forever()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve the paint survey prompts to many surveyors over TCP.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args()
+    try:
+        asyncio.run(SurveyServer(host=args.host, port=args.port).serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#  madakixo
+## Synthetic room inventories for load testing and benchmarks. Rooms are drawn
+## around the defaults of the interactive calculators (paint_1.py / patch_2.py)
+## from a seeded generator, so the same seed always gives the same inventory.
+
+import argparse
+import math
+import random
+from typing import Dict, Iterator, List, Optional
+
+from batch_estimate import Room, WRITERS, write_rooms
+from paint_1 import PaintCalculator
+from room_defaults import DEFAULT_HEIGHT, DOOR_HEIGHT, ROOM_TYPES
+
+# Share of each room type in a typical dwelling, and of each paint type on the walls.
+ROOM_MIX: Dict[str, float] = {'Parlour': 0.2, 'Bedroom': 0.4, 'Toilet': 0.2, 'Kitchen': 0.2}
+PAINT_MIX: Dict[str, float] = {
+    'Emulsion paint': 0.6,
+    'Sandtex-Matt': 0.1,
+    'Gloss paint': 0.08,
+    'Eggshell paint': 0.08,
+    'Undercoat': 0.04,
+    'Alkaline resisting primer to brick/block work': 0.04,
+    'Alkaline resisting primer to lime plaster': 0.02,
+    'Staining': 0.02,
+    'Synthetic Varnish': 0.02,
+}
+
+
+def _poisson(rng: random.Random, mean: float) -> int:
+    """Small-mean Poisson draw (Knuth), used for window and door counts."""
+    limit, k, p = math.exp(-mean), 0, 1.0
+    while True:
+        p *= rng.random()
+        if p <= limit:
+            return k
+        k += 1
+
+
+def generate_rooms(count: int, seed: int = 0, rooms_per_storey: int = 40, storeys_per_building: int = 12,
+                   paint_mix: Optional[Dict[str, float]] = None) -> Iterator[Room]:
+    """
+    Yield `count` synthetic rooms, one at a time.
+
+    Perimeters vary ±20% around the room type default, heights between 2.7 m and 3.6 m, and
+    opening counts follow a Poisson distribution around the defaults with sizes ±15%. Rooms
+    also carry room_type, building and storey columns.
+
+    Args:
+        count: Number of rooms to generate.
+        seed: Random seed; the same seed and arguments always give the same rooms.
+        rooms_per_storey: Rooms on each storey before moving up a floor.
+        storeys_per_building: Storeys in each building before starting the next one.
+        paint_mix: Paint type weights (PAINT_MIX by default; names must exist in PaintCalculator).
+    """
+    rng = random.Random(seed)
+    room_types: List[str] = list(ROOM_MIX)
+    room_weights = list(ROOM_MIX.values())
+    paint_mix = paint_mix or PAINT_MIX
+    unknown = set(paint_mix) - set(PaintCalculator().coverage_rates)
+    if unknown:
+        raise KeyError(f"Paint types not found in the database: {', '.join(sorted(unknown))}")
+    paint_types = list(paint_mix)
+    paint_weights = list(paint_mix.values())
+
+    for i in range(count):
+        room_type = rng.choices(room_types, room_weights)[0]
+        perimeter, windows, w_length, w_height, doors, d_length = ROOM_TYPES[room_type]
+        storey, n = divmod(i, rooms_per_storey)
+        building, storey = divmod(storey, storeys_per_building)
+        yield {
+            'room_name': f"B{building + 1}-S{storey + 1}-{room_type}-{n + 1}",
+            'perimeter': round(perimeter * rng.uniform(0.8, 1.2), 2),
+            'height': round(DEFAULT_HEIGHT * rng.uniform(0.9, 1.2), 2),
+            'window_areas': [round(w_length * w_height * rng.uniform(0.85, 1.15), 3)
+                             for _ in range(_poisson(rng, windows))],
+            'door_areas': [round(d_length * DOOR_HEIGHT * rng.uniform(0.85, 1.15), 3)
+                           for _ in range(max(1, _poisson(rng, doors)))],
+            'paint_type': rng.choices(paint_types, paint_weights)[0],
+            'room_type': room_type,
+            'building': f"B{building + 1}",
+            'storey': storey + 1,
+        }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate a synthetic room inventory for load testing.")
+    parser.add_argument('output', help=f"Output file ({', '.join(sorted(WRITERS))})")
+    parser.add_argument('--rooms', type=int, default=1000, help="Number of rooms (default 1000)")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    written = write_rooms(args.output, generate_rooms(args.rooms, args.seed))
+    print(f"Wrote {written:,} rooms to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
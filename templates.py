@@ -0,0 +1,86 @@
+#  madakixo
+## Typical-floor templating: a floor plan or unit type is estimated once and
+## reused by any number of instances, each with a multiplier and optional
+## per-room overrides. Work scales with the number of unique designs, not with
+## the number of physical rooms.
+
+from collections import defaultdict
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from batch_estimate import Room, estimate_rooms, normalise_room
+from paint_1 import PaintCalculator
+
+
+class Instance(NamedTuple):
+    """Use of a template: `multiplier` identical copies, with `overrides` keyed by room name (None for none)."""
+    template: str
+    multiplier: int = 1
+    overrides: Optional[Dict[str, Dict]] = None
+
+    def design_key(self) -> Tuple:
+        """Hashable key identifying the template plus overrides, used to deduplicate instances."""
+        return self.template, tuple(sorted(
+            (room_name, tuple(sorted((field, repr(value)) for field, value in changes.items())))
+            for room_name, changes in (self.overrides or {}).items()))
+
+
+class TemplateEstimator:
+    """Estimates buildings described as templates (typical floors/units) and their instances."""
+
+    def __init__(self, calculator: Optional[PaintCalculator] = None):
+        self.calculator = calculator or PaintCalculator()
+        self.templates: Dict[str, Dict[str, Room]] = {}
+        self._room_litres: Dict[str, Dict[str, float]] = {}
+        self._totals: Dict[str, Dict[str, float]] = {}
+
+    def add_template(self, name: str, rooms: List[Dict]) -> None:
+        """Register a template (e.g. 'Typical floor A') made of rooms with unique room names."""
+        self.templates[name] = {room['room_name']: normalise_room(room) for room in rooms}
+        self._room_litres.pop(name, None)
+        self._totals.pop(name, None)
+
+    def template_totals(self, name: str) -> Dict[str, float]:
+        """Litres per paint type for one copy of a template; calculated once and cached."""
+        if name not in self._totals:
+            rooms = self.templates[name]
+            litres: Dict[str, float] = {}
+            totals: Dict[str, float] = defaultdict(float)
+            for room_name, paint_type, amount in estimate_rooms(self.calculator, rooms.values()):
+                litres[room_name] = amount
+                totals[paint_type] += amount
+            self._room_litres[name] = litres
+            self._totals[name] = dict(totals)
+        return self._totals[name]
+
+    def design_totals(self, instance: Instance) -> Dict[str, float]:
+        """Litres per paint type for one copy of an instance, re-estimating only overridden rooms."""
+        totals = dict(self.template_totals(instance.template))
+        rooms = self.templates[instance.template]
+        for room_name, changes in (instance.overrides or {}).items():
+            if room_name not in rooms:
+                raise KeyError(f"Room {room_name} not found in template {instance.template}.")
+            base = rooms[room_name]
+            totals[base['paint_type']] -= self._room_litres[instance.template][room_name]
+            room = normalise_room({**base, **changes})
+            _, paint_type, amount = next(estimate_rooms(self.calculator, [room]))
+            totals[paint_type] = totals.get(paint_type, 0.0) + amount
+        return totals
+
+    def estimate(self, instances: List[Instance]) -> Dict[str, float]:
+        """
+        Total litres per paint type over all instances.
+
+        Instances with the same template and overrides are merged first, so each unique
+        design is estimated once and then scaled by its total multiplier.
+        """
+        designs: Dict[Tuple, Tuple[Instance, int]] = {}
+        for instance in instances:
+            key = instance.design_key()
+            first, count = designs.get(key, (instance, 0))
+            designs[key] = (first, count + instance.multiplier)
+
+        totals: Dict[str, float] = defaultdict(float)
+        for instance, count in designs.values():
+            for paint_type, litres in self.design_totals(instance).items():
+                totals[paint_type] += litres * count
+        return dict(totals)
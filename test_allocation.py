@@ -0,0 +1,61 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from allocation import _min_cost_flow, allocate_stock
+
+
+def brute_force(need, supply, cost):
+    """
+    Cheapest integer flow among those delivering the most litres. With integer needs and
+    stock the transportation polytope has integer vertices, so this is also the LP optimum.
+    """
+    sites, depots = cost.shape
+    best = (-1, 0.0)
+    for cells in itertools.product(*(range(int(min(need[s], supply[d])) + 1)
+                                     for s in range(sites) for d in range(depots))):
+        flow = np.array(cells, dtype=np.float64).reshape(sites, depots)
+        if (flow.sum(axis=1) > need).any() or (flow.sum(axis=0) > supply).any():
+            continue
+        candidate = (flow.sum(), -(flow * cost).sum())
+        best = max(best, candidate)
+    return best[0], -best[1]
+
+
+@pytest.mark.parametrize('shape', [(2, 2), (2, 3), (3, 2)])
+def test_min_cost_flow_matches_brute_force(shape):
+    rng = np.random.default_rng(sum(shape))
+    for _ in range(40):
+        need = rng.integers(0, 4, shape[0]).astype(np.float64)
+        supply = rng.integers(0, 4, shape[1]).astype(np.float64)
+        cost = rng.integers(1, 10, shape).astype(np.float64)
+        flow = _min_cost_flow(need, supply, cost)
+        delivered, total_cost = brute_force(need, supply, cost)
+        assert (flow >= -1e-9).all()
+        assert (flow.sum(axis=1) <= need + 1e-9).all()
+        assert (flow.sum(axis=0) <= supply + 1e-9).all()
+        assert flow.sum() == pytest.approx(delivered)
+        assert (flow * cost).sum() == pytest.approx(total_cost)
+
+
+def test_distance_beats_nearest_when_greedy_blocks_a_depot():
+    # The nearest pair (B, D1) takes D1's only litre and leaves A to go to the far depot.
+    requirements = {'A': {'Emulsion paint': 1.0}, 'B': {'Emulsion paint': 1.0}}
+    stock = {'D1': {'Emulsion paint': 1.0}, 'D2': {'Emulsion paint': 1.0}}
+    sites = {'A': (0.0, 0.0), 'B': (1.9, 0.0)}
+    depots = {'D1': (1.0, 0.0), 'D2': (3.0, 0.0)}
+    results = {}
+    for objective in ('nearest', 'distance'):
+        shipments, unmet = allocate_stock(requirements, stock, sites, depots, objective)
+        assert unmet == {}
+        results[objective] = sum(s.litres * s.distance for s in shipments)
+    assert results['nearest'] == pytest.approx(3.9)
+    assert results['distance'] == pytest.approx(2.1)
+
+
+def test_unmet_requirements_are_reported():
+    shipments, unmet = allocate_stock({'A': {'Gloss paint': 5.0}}, {'D1': {'Gloss paint': 2.0}},
+                                      {'A': (0.0, 0.0)}, {'D1': (1.0, 1.0)}, 'distance')
+    assert sum(s.litres for s in shipments) == pytest.approx(2.0)
+    assert unmet == {'A': {'Gloss paint': pytest.approx(3.0)}}
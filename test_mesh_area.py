@@ -0,0 +1,57 @@
+import pytest
+
+from mesh_area import area_by_group, read_obj
+
+# A 2 x 1 rectangle (area 2) and a right triangle with legs 2 and 3 (area 3), in separate planes.
+VERTICES = 'v 0 0 0\nv 2 0 0\nv 2 1 0\nv 0 1 0\nv 0 0 5\nv 2 0 5\nv 0 3 5\n'
+
+
+def areas(tmp_path, text, newline='\n'):
+    path = tmp_path / 'mesh.obj'
+    path.write_bytes(text.replace('\n', newline).encode('utf-8'))
+    return area_by_group(str(path))
+
+
+def test_quad_and_triangle(tmp_path):
+    assert areas(tmp_path, VERTICES + 'f 1 2 3 4\nf 5 6 7\n') == {'default': pytest.approx(5.0)}
+
+
+def test_texture_and_normal_indices(tmp_path):
+    text = VERTICES + 'vt 0 0\nvn 0 0 1\nf 1/1/1 2/1/1 3/1/1 4/1/1\nf 5//1 6//1 7//1\nf 5/1 6/1 7/1\n'
+    assert areas(tmp_path, text) == {'default': pytest.approx(8.0)}
+
+
+def test_negative_indices_count_back_from_the_face(tmp_path):
+    text = 'v 0 0 0\nv 2 0 0\nv 2 1 0\nv 0 1 0\nf -4 -3 -2 -1\nv 0 0 5\nv 2 0 5\nv 0 3 5\nf -3 -2 -1\n'
+    assert areas(tmp_path, text) == {'default': pytest.approx(5.0)}
+
+
+def test_groups_usemtl_and_bare_g(tmp_path):
+    text = VERTICES + 'g wall\nf 1 2 3 4\nusemtl gloss\nf 5 6 7\ng\nf 1 2 3\n'
+    assert areas(tmp_path, text) == {'wall': pytest.approx(2.0), 'gloss': pytest.approx(3.0),
+                                     'default': pytest.approx(1.0)}
+
+
+def test_extra_vertex_components(tmp_path):
+    text = VERTICES.replace('\n', ' 1.0\n') + 'f 1 2 3 4\n'
+    assert areas(tmp_path, text) == {'default': pytest.approx(2.0)}
+
+
+def test_crlf_line_endings(tmp_path):
+    text = VERTICES + 'g wall\nf 1 2 3 4\ng\nf 5 6 7\n'
+    assert areas(tmp_path, text, '\r\n') == {'wall': pytest.approx(2.0), 'default': pytest.approx(3.0)}
+
+
+def test_indented_lines(tmp_path):
+    # An ignored indented vertex would shift every later index and change the areas.
+    text = '  v 5 0 0\n' + VERTICES + '\tf 2 3 4 5\n  g side\n  f 6 7 8\n'
+    assert areas(tmp_path, text) == {'default': pytest.approx(2.0), 'side': pytest.approx(3.0)}
+
+
+def test_no_faces(tmp_path):
+    path = tmp_path / 'mesh.obj'
+    path.write_text(VERTICES + '# vertices only\n')
+    triangles, group_ids, names = read_obj(str(path))
+    assert triangles.shape == (0, 3, 3)
+    assert len(group_ids) == 0
+    assert area_by_group(str(path)) == {}
@@ -0,0 +1,94 @@
+import gzip
+import threading
+
+import pytest
+
+from frozen_calculator import FrozenPaintCalculator
+from pipeline_ingest import IngestPipeline
+
+
+class FailingCalculator(FrozenPaintCalculator):
+    def calculate_arrays(self, *columns):
+        raise RuntimeError("estimate stage failed")
+
+
+def write_archive(path, rooms, bad_row=None):
+    with gzip.open(path, 'wt', encoding='utf-8') as f:
+        f.write('room_name,perimeter,height,window_areas,door_areas,paint_type\n')
+        for i in range(rooms):
+            perimeter = 'not a number' if i == bad_row else '12.5'
+            f.write(f'Room {i},{perimeter},3,1.2;0.8,1.9,Emulsion paint\n')
+
+
+def zstd_compress(data):
+    """One zstd frame, with whichever zstd module is installed (the test is skipped if neither is)."""
+    try:
+        from compression import zstd
+        return zstd.compress(data)
+    except ImportError:
+        zstandard = pytest.importorskip('zstandard')
+        return zstandard.ZstdCompressor().compress(data)
+
+
+def run_with_timeout(pipeline, path, timeout=20.0):
+    """Run the pipeline in a thread so a hang fails the test instead of blocking it."""
+    outcome = {}
+
+    def target():
+        try:
+            outcome['result'] = pipeline.run(path)
+        except BaseException as e:
+            outcome['error'] = e
+
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), "IngestPipeline.run did not return"
+    return outcome
+
+
+def test_totals_match_calculator(tmp_path):
+    path = str(tmp_path / 'rooms.csv.gz')
+    write_archive(path, 5000)
+    outcome = run_with_timeout(IngestPipeline(batch_rooms=700, block_size=4096), path)
+    totals, rooms = outcome['result']
+    expected = FrozenPaintCalculator().calculate_paint_requirement('Room', 12.5, 3, [1.2, 0.8], [1.9], 'Emulsion paint')
+    assert rooms == 5000
+    assert totals['Emulsion paint'] == pytest.approx(5000 * expected)
+
+
+def test_estimate_stage_failure_stops_pipeline(tmp_path):
+    path = str(tmp_path / 'rooms.csv.gz')
+    write_archive(path, 200000)
+    pipeline = IngestPipeline(FailingCalculator(), block_size=4096, batch_rooms=100, queue_size=1)
+    outcome = run_with_timeout(pipeline, path)
+    assert isinstance(outcome.get('error'), RuntimeError)
+
+
+def test_parse_stage_failure_is_raised(tmp_path):
+    path = str(tmp_path / 'rooms.csv.gz')
+    write_archive(path, 200000, bad_row=50)
+    outcome = run_with_timeout(IngestPipeline(block_size=4096, batch_rooms=100, queue_size=1), path)
+    assert isinstance(outcome.get('error'), ValueError)
+
+
+def test_truncated_archive_is_an_error(tmp_path):
+    path = str(tmp_path / 'rooms.csv.gz')
+    write_archive(path, 20000)
+    with open(path, 'rb') as f:
+        data = f.read()
+    with open(path, 'wb') as f:
+        f.write(data[:len(data) // 2])
+    outcome = run_with_timeout(IngestPipeline(block_size=4096), path)
+    assert isinstance(outcome.get('error'), ValueError)
+
+
+def test_concatenated_zstd_frames(tmp_path):
+    path = str(tmp_path / 'rooms.csv.zst')
+    header = b'room_name,perimeter,height,window_areas,door_areas,paint_type\n'
+    rows = [b''.join(f'Room {i},12.5,3,1.2;0.8,1.9,Emulsion paint\n'.encode() for i in range(start, start + 1000))
+            for start in (0, 1000, 2000)]
+    with open(path, 'wb') as f:
+        f.write(zstd_compress(header + rows[0]) + zstd_compress(rows[1]) + zstd_compress(rows[2]))
+    totals, rooms = run_with_timeout(IngestPipeline(block_size=4096), path)['result']
+    assert rooms == 3000
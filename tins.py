@@ -0,0 +1,122 @@
+#  madakixo
+## Tin packing: turns aggregated litres per paint type into the cheapest
+## combination of tin sizes that covers the requirement, instead of rounding
+## up room by room.
+
+from functools import reduce
+from math import ceil, gcd
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Price per tin by tin size in liters.
+DEFAULT_TIN_PRICES: Dict[float, float] = {1: 9.0, 2.5: 20.0, 5: 36.0, 20: 120.0}
+
+Packing = Tuple[Dict[float, int], float]
+
+
+class TinPacker:
+    """Exact minimum-cost cover of a volume by tins of fixed sizes (unbounded supply)."""
+
+    def __init__(self, prices: Optional[Dict[float, float]] = None):
+        """
+        Args:
+            prices: Price per tin keyed by tin size in liters (DEFAULT_TIN_PRICES by default).
+        """
+        self.prices = dict(prices if prices is not None else DEFAULT_TIN_PRICES)
+        if not self.prices:
+            raise ValueError("At least one tin size is required.")
+        sizes_ml = {size: int(round(size * 1000)) for size in self.prices}
+        # Work in units of the largest volume that divides every tin size (0.5 L for 1/2.5/5/20 L).
+        self.unit_ml = reduce(gcd, sizes_ml.values())
+        self.units = {size: ml // self.unit_ml for size, ml in sizes_ml.items()}
+        self.best = min(self.prices, key=lambda size: (self.prices[size] / size, -size))
+        # Some optimal packing uses fewer than best-tin-size (in units) tins of other sizes, so only
+        # the part of a requirement above `bound` ever needs to be filled with the best-value tin.
+        self.bound = self.units[self.best] * max(self.units.values())
+        self._cost: List[float] = [0.0]
+        self._choice: List[Optional[float]] = [None]
+        self._extend(self.bound + self.units[self.best])
+
+    def _extend(self, limit: int) -> None:
+        """Fill the DP table: _cost[a] is the cheapest cover of at least `a` units."""
+        for amount in range(len(self._cost), limit + 1):
+            self._cost.append(float('inf'))
+            self._choice.append(None)
+            for size, units in self.units.items():
+                cost = self._cost[max(0, amount - units)] + self.prices[size]
+                if cost < self._cost[amount]:
+                    self._cost[amount], self._choice[amount] = cost, size
+
+    def pack(self, litres: float) -> Packing:
+        """
+        Cheapest tins covering `litres`.
+
+        Returns:
+            Tuple[Dict[float, int], float]: Number of tins per size, and total price.
+        """
+        if litres <= 0:
+            return {}, 0.0
+        amount = ceil(round(litres * 1000, 6) / self.unit_ml)
+        best_units = self.units[self.best]
+        bulk = max(0, (amount - self.bound) // best_units)
+        amount -= bulk * best_units
+        tins: Dict[float, int] = {self.best: bulk} if bulk else {}
+        cost = bulk * self.prices[self.best] + self._cost[amount]
+        while amount > 0:
+            size = self._choice[amount]
+            tins[size] = tins.get(size, 0) + 1
+            amount -= self.units[size]
+        return dict(sorted(tins.items(), reverse=True)), cost
+
+
+_packers: Dict[Tuple, TinPacker] = {}
+
+
+def get_packer(prices: Dict[float, float]) -> TinPacker:
+    """Shared TinPacker for a price table, so the DP table is built once per distinct table."""
+    key = tuple(sorted(prices.items()))
+    if key not in _packers:
+        _packers[key] = TinPacker(prices)
+    return _packers[key]
+
+
+def pack_requirements(totals: Dict[str, float], prices: Optional[Dict[float, float]] = None,
+                      prices_by_type: Optional[Dict[str, Dict[float, float]]] = None) -> Dict[str, Packing]:
+    """
+    Cheapest tins for each paint type's aggregated requirement.
+
+    Args:
+        totals: Litres per paint type, e.g. from BatchEstimator.run.
+        prices: Tin prices used for every paint type without its own entry.
+        prices_by_type: Tin prices for particular paint types.
+    """
+    packed: Dict[str, Packing] = {}
+    for paint_type, litres in totals.items():
+        type_prices = (prices_by_type or {}).get(paint_type, prices if prices is not None else DEFAULT_TIN_PRICES)
+        packed[paint_type] = get_packer(type_prices).pack(litres)
+    return packed
+
+
+def pack_sites(site_totals: Dict[str, Dict[str, float]], prices: Optional[Dict[float, float]] = None,
+               allowed_sizes: Optional[Dict[str, Iterable[float]]] = None) -> Dict[str, Dict[str, Packing]]:
+    """
+    Pack each delivery site separately, optionally restricting the tin sizes a site accepts
+    (e.g. no 20 L drums on a site without a store).
+
+    Args:
+        site_totals: Litres per paint type for each site.
+        prices: Tin prices (DEFAULT_TIN_PRICES by default).
+        allowed_sizes: Tin sizes each site can take; sites not listed accept every size.
+
+    Raises:
+        ValueError: If a site's allowed sizes leave no priced tin size to pack with.
+    """
+    prices = prices if prices is not None else DEFAULT_TIN_PRICES
+    packed: Dict[str, Dict[str, Packing]] = {}
+    for site, totals in site_totals.items():
+        site_prices = prices
+        if allowed_sizes and site in allowed_sizes:
+            site_prices = {size: price for size, price in prices.items() if size in set(allowed_sizes[site])}
+            if not site_prices:
+                raise ValueError(f"Site {site} allows no priced tin size (allowed: {sorted(allowed_sizes[site])}, priced: {sorted(prices)}).")
+        packed[site] = pack_requirements(totals, site_prices)
+    return packed
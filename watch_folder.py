@@ -0,0 +1,147 @@
+#  madakixo
+## Watch-folder daemon: polls a shared directory for new or changed survey files
+## and estimates each one through BatchEstimator on a bounded worker pool. Results
+## are written atomically next to the input as <name>.estimate.csv. Polling is used
+## instead of inotify so it works on network shares and every OS.
+
+import argparse
+import json
+import os
+import signal
+import time
+from concurrent.futures import CancelledError, Future, ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from batch_estimate import READERS, BatchEstimator
+
+RESULT_SUFFIX: str = '.estimate.csv'
+STATE_FILE: str = '.paint_watch_state.json'
+
+Signature = Tuple[int, int]
+
+
+def estimate_file(input_path: str) -> Dict[str, float]:
+    """Worker job: estimate one file, writing results atomically next to it."""
+    output_path = input_path + RESULT_SUFFIX
+    tmp_path = output_path + '.tmp'
+    try:
+        totals = BatchEstimator(progress=None).run(input_path, tmp_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    os.replace(tmp_path, output_path)
+    return totals
+
+
+def _ignore_sigint() -> None:
+    """Worker initializer: Ctrl+C goes to the whole process group, but only the daemon should stop."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+class WatchFolder:
+    """Polls a directory and estimates each new or changed survey file exactly once."""
+
+    def __init__(self, directory: str, workers: int = 2, interval: float = 2.0, state_path: Optional[str] = None):
+        """
+        Args:
+            directory: Folder surveyors upload to.
+            workers: Maximum number of files estimated at the same time.
+            interval: Seconds between directory scans.
+            state_path: Where processed-file signatures are kept (default: a hidden file in `directory`).
+        """
+        self.directory = directory
+        self.workers = workers
+        self.interval = interval
+        self.state_path = state_path or os.path.join(directory, STATE_FILE)
+        self.processed: Dict[str, Signature] = self._load_state()
+        self._seen: Dict[str, Signature] = {}
+        self._running: Dict[str, Tuple[Signature, Future]] = {}
+
+    def _load_state(self) -> Dict[str, Signature]:
+        if not os.path.exists(self.state_path):
+            return {}
+        with open(self.state_path, encoding='utf-8') as f:
+            return {name: tuple(sig) for name, sig in json.load(f).items()}
+
+    def _save_state(self) -> None:
+        tmp_path = self.state_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.processed, f)
+        os.replace(tmp_path, self.state_path)
+
+    def scan(self) -> List[Tuple[str, Signature]]:
+        """
+        Survey files that are new or changed since they were last processed and whose size and
+        modification time have not changed since the previous scan (i.e. the upload has finished).
+        """
+        ready: List[Tuple[str, Signature]] = []
+        current: Dict[str, Signature] = {}
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if (not entry.is_file() or entry.name.endswith(RESULT_SUFFIX)
+                        or os.path.splitext(entry.name)[1].lower() not in READERS):
+                    continue
+                stat = entry.stat()
+                signature = (stat.st_mtime_ns, stat.st_size)
+                current[entry.name] = signature
+                if (self.processed.get(entry.name) != signature and self._seen.get(entry.name) == signature
+                        and entry.name not in self._running):
+                    ready.append((entry.name, signature))
+        self._seen = current
+        return ready
+
+    def _collect(self) -> None:
+        """
+        Record finished jobs; a failed file is retried when it next changes. A cancelled or
+        interrupted job is not recorded, so the file is estimated again on the next start.
+        """
+        for name, (signature, future) in list(self._running.items()):
+            if not future.done():
+                continue
+            del self._running[name]
+            try:
+                totals = future.result()
+                print(f"Estimated {name}: " + ", ".join(f"{p} {l:.2f} liters" for p, l in sorted(totals.items())))
+            except (CancelledError, KeyboardInterrupt):
+                print(f"Estimate of {name} was interrupted; it will be retried.")
+                continue
+            except Exception as e:
+                print(f"Error estimating {name}: {e}")
+            self.processed[name] = signature
+            self._save_state()
+
+    def poll_once(self, pool: ProcessPoolExecutor) -> None:
+        """One scan: collect finished jobs and submit ready files while workers are free."""
+        self._collect()
+        for name, signature in self.scan():
+            if len(self._running) >= self.workers:
+                break
+            self._running[name] = (signature, pool.submit(estimate_file, os.path.join(self.directory, name)))
+
+    def run_forever(self) -> None:
+        """Poll until interrupted (Ctrl+C), then wait for running jobs to finish."""
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_ignore_sigint) as pool:
+            try:
+                while True:
+                    self.poll_once(pool)
+                    time.sleep(self.interval)
+            except KeyboardInterrupt:
+                print("Stopping; waiting for running estimates to finish.")
+            for _, future in self._running.values():
+                if not future.cancelled():
+                    future.exception()
+            self._collect()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Estimate survey files as they arrive in a folder.")
+    parser.add_argument('directory')
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--interval', type=float, default=2.0, help="Seconds between scans")
+    args = parser.parse_args()
+    WatchFolder(args.directory, args.workers, args.interval).run_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+#  madakixo
+## Excel (.xlsx) room schedule import. Workbooks are opened read-only and read
+## row by row, so even very large schedules are never loaded into memory whole.
+## Column headers are mapped to room fields, so each subcontractor's layout can
+## be used as-is. Requires openpyxl.
+
+import argparse
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Sequence
+
+from batch_estimate import BatchEstimator, Room, normalise_room
+
+# Header (case-insensitive) used for each room field unless overridden.
+DEFAULT_COLUMNS: Dict[str, str] = {
+    'room_name': 'room',
+    'perimeter': 'perimeter',
+    'height': 'height',
+    'window_areas': 'window areas',
+    'door_areas': 'door areas',
+    'paint_type': 'paint type',
+    # Alternative to the area columns: a count and a typical size per opening kind.
+    'windows': 'windows',
+    'window_length': 'window length',
+    'window_height': 'window height',
+    'doors': 'doors',
+    'door_length': 'door length',
+    'door_height': 'door height',
+}
+REQUIRED_FIELDS: List[str] = ['perimeter', 'height']
+
+
+def _openings(values: Dict, kind: str) -> List[float]:
+    """Opening areas from an '<kind> areas' column or from count × length × height columns."""
+    areas = values.get(f'{kind}_areas')
+    if areas not in (None, ''):
+        return [float(areas)] if isinstance(areas, (int, float)) else [float(a) for a in str(areas).split(';') if a.strip()]
+    count = values.get(f'{kind}s')
+    if count in (None, ''):
+        return []
+    count = int(count)
+    if count < 0:
+        raise ValueError(f"negative {kind} count {count}")
+    if count == 0:
+        # No openings of this kind: the size columns may be left blank.
+        return []
+    blank = [f'{kind}_{size}' for size in ('length', 'height') if values.get(f'{kind}_{size}') in (None, '')]
+    if blank:
+        raise ValueError(f"blank {', '.join(blank)} for {count} {kind}(s)")
+    return [float(values[f'{kind}_length']) * float(values[f'{kind}_height'])] * count
+
+
+def _header_index(header: Sequence, columns: Dict[str, str]) -> Dict[str, int]:
+    positions = {str(name).strip().lower(): i for i, name in enumerate(header) if name is not None}
+    index = {field: positions[name.strip().lower()] for field, name in columns.items() if name.strip().lower() in positions}
+    missing = [columns[field] for field in REQUIRED_FIELDS if field not in index]
+    # A count column is only usable with the typical size of that kind of opening.
+    for kind in ('window', 'door'):
+        if f'{kind}s' in index:
+            missing += [columns[field] for field in (f'{kind}_length', f'{kind}_height') if field not in index]
+    if missing:
+        raise ValueError(f"Missing column(s) in workbook: {', '.join(missing)}")
+    return index
+
+
+def read_xlsx_rooms(path: str, start: int = 0, columns: Optional[Dict[str, str]] = None,
+                    sheet: Optional[str] = None) -> Iterator[Room]:
+    """
+    Stream rooms from an .xlsx workbook, skipping the first `start` rooms.
+
+    A row with a blank or non-numeric required value raises ValueError naming its sheet row,
+    rather than being skipped, so room offsets (and checkpoints) stay aligned with the sheet.
+
+    Args:
+        path: Workbook path.
+        start: Number of data rows to skip (used when resuming from a checkpoint).
+        columns: Header for each room field, overriding DEFAULT_COLUMNS.
+        sheet: Worksheet name (the active sheet by default).
+    """
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        worksheet = workbook[sheet] if sheet else workbook.active
+        rows = worksheet.iter_rows(values_only=True)
+        index = _header_index(next(rows, ()), {**DEFAULT_COLUMNS, **(columns or {})})
+        data_rows = ((sheet_row, row) for sheet_row, row in enumerate(rows, 2) if any(cell is not None for cell in row))
+        for number, (sheet_row, row) in enumerate(islice(data_rows, start, None), start + 1):
+            values = {field: row[i] if i < len(row) else None for field, i in index.items()}
+            try:
+                blank = [field for field in REQUIRED_FIELDS if values[field] in (None, '')]
+                if blank:
+                    raise ValueError(f"blank {', '.join(blank)}")
+                room = normalise_room({
+                    'room_name': values.get('room_name') or f"Row {number}",
+                    'perimeter': values['perimeter'],
+                    'height': values['height'],
+                    'window_areas': _openings(values, 'window'),
+                    'door_areas': _openings(values, 'door'),
+                    'paint_type': values.get('paint_type'),
+                })
+            except (TypeError, ValueError) as e:
+                raise ValueError(f"{path}, row {sheet_row}: {e}") from e
+            yield room
+    finally:
+        workbook.close()
+
+
+def count_xlsx_rooms(path: str) -> int:
+    """Data rows in the active sheet according to the workbook's stored dimensions (0 if it has none)."""
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path, read_only=True)
+    try:
+        return max(0, (workbook.active.max_row or 1) - 1)
+    finally:
+        workbook.close()
+
+
+def read_xlsx_chunks(path: str, chunk_size: int = 10000, columns: Optional[Dict[str, str]] = None,
+                     sheet: Optional[str] = None) -> Iterator[List[Room]]:
+    """Rooms from a workbook in lists of up to `chunk_size`, for feeding batch code chunk by chunk."""
+    rooms = read_xlsx_rooms(path, columns=columns, sheet=sheet)
+    while True:
+        chunk = list(islice(rooms, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Estimate paint for a room schedule workbook (.xlsx).")
+    parser.add_argument('input', help="Workbook (.xlsx)")
+    parser.add_argument('output', help="Per-room results CSV")
+    parser.add_argument('--column', action='append', default=[], metavar='FIELD=HEADER',
+                        help=f"Map a room field to a column header, e.g. perimeter='Perim (m)'. Fields: {', '.join(DEFAULT_COLUMNS)}")
+    parser.add_argument('--checkpoint', help="Checkpoint file; an existing one is resumed")
+    args = parser.parse_args()
+
+    columns = dict(mapping.split('=', 1) for mapping in args.column)
+    unknown = set(columns) - set(DEFAULT_COLUMNS)
+    if unknown:
+        parser.error(f"Unknown field(s): {', '.join(sorted(unknown))}")
+    totals = BatchEstimator().run(args.input, args.output, args.checkpoint,
+                                  reader=lambda path, start: read_xlsx_rooms(path, start, columns))
+    for paint_type, litres in sorted(totals.items()):
+        print(f"{paint_type}: {litres:.2f} liters")
+
+
+if __name__ == "__main__":
+    main()